@@ -0,0 +1,115 @@
+from typing import List
+
+from PyQt5.QtWidgets import (QDialog, QFormLayout, QDialogButtonBox, QComboBox, QPushButton,
+                             QFileDialog, QLineEdit, QSpinBox, QTreeView)
+from PyQt5.QtGui import QStandardItemModel, QStandardItem
+from PyQt5.QtCore import Qt, QThread
+
+from ...model.data import SpatialData
+from ...model.drivers import DriverInfo, driver_catalogue
+
+
+class BatchExportDialog(QDialog):
+
+    def __init__(self, spatial_data: SpatialData, parent=None) -> None:
+        super().__init__(parent)
+
+        self.setWindowTitle("Exportovat vrstvy do souborů")
+
+        layout = QFormLayout()
+        self.setLayout(layout)
+
+        self._spatial_data = spatial_data
+        self._folder: str = None
+
+        self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        self.button_box.button(QDialogButtonBox.Ok).setEnabled(False)
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+
+        self.treeview = QTreeView()
+        self.model = QStandardItemModel()
+        self.model.setColumnCount(1)
+        self.model.setHeaderData(0, Qt.Horizontal, "Vrstvy")
+        self.root = self.model.invisibleRootItem()
+        self.treeview.setModel(self.model)
+        self.model.itemChanged.connect(self.enable_ok)
+
+        for layer_name in self._spatial_data.layers_names:
+            item = QStandardItem()
+            item.setData(layer_name, Qt.ItemDataRole.DisplayRole)
+            item.setCheckable(True)
+            self.root.appendRow(item)
+
+        self.save_type = QComboBox()
+
+        for driver_info in driver_catalogue().writable_vector_drivers:
+            self.save_type.addItem("{} (*.{})".format(driver_info.long_name, driver_info.extension),
+                                   driver_info)
+
+        self.folder_select = QPushButton("...", self)
+        self.folder_select.clicked.connect(self.set_selected_folder)
+
+        self.folder_name = QLineEdit(self)
+        self.folder_name.setReadOnly(True)
+
+        self.workers = QSpinBox(self)
+        self.workers.setRange(1, max(1, QThread.idealThreadCount() - 1))
+        self.workers.setValue(max(1, QThread.idealThreadCount() - 1))
+
+        self.group_transactions = QSpinBox(self)
+        self.group_transactions.setRange(1, 10000000)
+        self.group_transactions.setSingleStep(10000)
+        self.group_transactions.setValue(100000)
+
+        layout.addRow("Vrstvy k exportu:", self.treeview)
+        layout.addRow("Uložit jako:", self.save_type)
+        layout.addRow("Zvolit složku:", self.folder_select)
+        layout.addRow("Výsledná složka:", self.folder_name)
+        layout.addRow("Počet souběžných exportů:", self.workers)
+        layout.addRow("Prvků v jedné transakci:", self.group_transactions)
+        layout.addWidget(self.button_box)
+
+    def set_selected_folder(self) -> None:
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder")
+        if folder:
+            self._folder = folder
+            self.folder_name.setText(folder)
+        self.enable_ok()
+
+    def enable_ok(self) -> None:
+        self.button_box.button(QDialogButtonBox.Ok).setEnabled(
+            self._folder is not None and 0 < len(self.layers_to_export))
+
+    @property
+    def layers_to_export(self) -> List[str]:
+        to_export = []
+        for i in range(self.model.rowCount()):
+            item = self.root.child(i)
+            if item.checkState() == Qt.CheckState.Checked:
+                to_export.append(item.data(Qt.ItemDataRole.DisplayRole))
+        return to_export
+
+    @property
+    def folder(self) -> str:
+        return self._folder
+
+    @property
+    def selected_driver(self) -> DriverInfo:
+        return self.save_type.currentData(Qt.UserRole)
+
+    @property
+    def selected_driver_name(self) -> str:
+        return self.selected_driver.name
+
+    @property
+    def selected_extension(self) -> str:
+        return self.selected_driver.extension
+
+    @property
+    def max_workers(self) -> int:
+        return self.workers.value()
+
+    @property
+    def group_transactions_size(self) -> int:
+        return self.group_transactions.value()
@@ -1,6 +1,6 @@
 from PyQt5.QtWidgets import (QDialog, QFormLayout, QDialogButtonBox, QPlainTextEdit, QLineEdit,
                              QComboBox)
-from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import pyqtSignal, QTimer
 
 from ...model.data import SpatialData
 
@@ -9,6 +9,8 @@ class CopyLayerDialog(QDialog):
 
     newLayerCopied = pyqtSignal()
 
+    preview_delay = 400
+
     def __init__(self, spatial_data: SpatialData, parent=None) -> None:
         super().__init__(parent)
 
@@ -20,10 +22,18 @@ class CopyLayerDialog(QDialog):
         self._spatial_data = spatial_data
 
         self.sql_layer = None
+        self._has_features = False
+
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(self.preview_delay)
+        self.preview_timer.timeout.connect(self.execute_SQL)
+
+        self._spatial_data.sqlPreviewFinished.connect(self.show_SQL_result)
 
         self.new_layer_name = QLineEdit("")
         self.sql_query = QPlainTextEdit("")
-        self.sql_query.textChanged.connect(self.execute_SQL)
+        self.sql_query.textChanged.connect(self.preview_timer.start)
         self.sql_type = QComboBox()
         self.sql_type.addItems(["OGRSQL", "SQLITE"])
         self.sql_error = QPlainTextEdit()
@@ -32,7 +42,7 @@ class CopyLayerDialog(QDialog):
         self.number_of_features = QLineEdit()
         self.number_of_features.setReadOnly(True)
 
-        self.sql_type.currentIndexChanged.connect(self.execute_SQL)
+        self.sql_type.currentIndexChanged.connect(self.preview_timer.start)
         self.new_layer_name.textChanged.connect(self.enable_ok)
 
         self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
@@ -48,17 +58,40 @@ class CopyLayerDialog(QDialog):
         layout.addWidget(self.button_box)
 
     def execute_SQL(self) -> None:
-        self._spatial_data.execute_sql(self.sql_query.toPlainText(),
-                                       sql_flavor=self.sql_type.currentText())
-        self.number_of_features.setText(str(self._spatial_data.sql_layer_feature_count))
-        self.sql_error.setPlainText(self._spatial_data.sql_error)
+        self._has_features = False
+        self.number_of_features.setText("Počítá se...")
+        self.enable_ok()
+        self._spatial_data.preview_sql(self.sql, sql_flavor=self.sql_flavor)
+
+    def show_SQL_result(self, feature_count: int, has_features: bool, error: str) -> None:
+        self._has_features = has_features
+        if feature_count < 0 and has_features:
+            self.number_of_features.setText("Alespoň 1")
+        else:
+            self.number_of_features.setText(str(max(0, feature_count)))
+        self.sql_error.setPlainText(error)
+        self.enable_ok()
 
     def enable_ok(self) -> None:
         text = self.new_layer_name.text()
         usable_name = 0 < len(text)
-        self.button_box.button(QDialogButtonBox.Ok).setDisabled(
-            not usable_name and 1 > self._spatial_data.sql_layer_feature_count)
+        self.button_box.button(QDialogButtonBox.Ok).setDisabled(not usable_name or
+                                                                not self._has_features)
+
+    def done(self, result: int) -> None:
+        self.preview_timer.stop()
+        self._spatial_data.cancel_sql_preview()
+        self._spatial_data.sqlPreviewFinished.disconnect(self.show_SQL_result)
+        super().done(result)
 
     @property
     def name_new_layer(self) -> str:
         return self.new_layer_name.text()
+
+    @property
+    def sql(self) -> str:
+        return self.sql_query.toPlainText()
+
+    @property
+    def sql_flavor(self) -> str:
+        return self.sql_type.currentText()
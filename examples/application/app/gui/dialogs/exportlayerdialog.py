@@ -1,11 +1,11 @@
 from pathlib import Path
+from typing import List
 from PyQt5.QtWidgets import (QDialog, QFormLayout, QDialogButtonBox, QComboBox, QPushButton,
-                             QFileDialog, QLineEdit)
+                             QFileDialog, QLineEdit, QSpinBox, QCheckBox)
 from PyQt5.QtCore import pyqtSignal, Qt
 
-from osgeo import gdal, ogr
-
 from ...model.data import SpatialData
+from ...model.drivers import DriverInfo, driver_catalogue
 from ..widgets.fileselect import FileSelectWidget
 
 
@@ -35,18 +35,9 @@ class ExportLayerDialog(QDialog):
         self.save_type = QComboBox()
         self.save_type.currentIndexChanged.connect(self.prepare_file_name)
 
-        for i in range(ogr.GetDriverCount()):
-            driver: ogr.Driver = ogr.GetDriver(i)
-            metadata = driver.GetMetadata()
-            if driver.TestCapability(ogr.ODrCCreateDataSource):
-                long_name = metadata.get("DMD_LONGNAME", None)
-                extension = metadata.get("DMD_EXTENSIONS", None)
-                if extension:
-                    extension = extension.split(" ")
-                    extension = extension[0]
-                if long_name and extension:
-                    self.save_type.addItem("{} (*.{})".format(long_name, extension),
-                                           (driver, extension))
+        for driver_info in driver_catalogue().writable_vector_drivers:
+            self.save_type.addItem("{} (*.{})".format(driver_info.long_name, driver_info.extension),
+                                   driver_info)
 
         self.file_select = QPushButton("...", self)
         self.file_select.clicked.connect(self.set_selected_file_name)
@@ -54,22 +45,33 @@ class ExportLayerDialog(QDialog):
         self.file_name = QLineEdit(self)
         self.file_name.setReadOnly(True)
 
+        self.group_transactions = QSpinBox(self)
+        self.group_transactions.setRange(1, 10000000)
+        self.group_transactions.setSingleStep(10000)
+        self.group_transactions.setValue(100000)
+
+        self.spatial_index = QCheckBox(self)
+        self.spatial_index.setChecked(True)
+
         layout.addRow("Vrstva:", self.layer_selection)
         layout.addRow("Uložit jako:", self.save_type)
         layout.addRow("Zvolit soubor:", self.file_select)
         layout.addRow("Výsledný soubor:", self.file_name)
+        layout.addRow("Prvků v jedné transakci:", self.group_transactions)
+        layout.addRow("Vytvořit prostorový index:", self.spatial_index)
         layout.addWidget(self.button_box)
 
     def set_selected_file_name(self):
-        self._selected_file_name, _ = QFileDialog.getSaveFileName(self, "Set File name")
+        self._selected_file_name, _ = QFileDialog.getSaveFileName(
+            self, "Set File name", filter=self.selected_driver.file_filter)
         self.prepare_file_name()
 
     def prepare_file_name(self):
         if self._selected_file_name:
             file_path = Path(self._selected_file_name)
-            ext = self.save_type.currentData(Qt.UserRole)[1]
-            if file_path.suffix.replace(".", "").lower() != ext.lower():
-                file_path = file_path.parent / "{}.{}".format(file_path.stem, ext)
+            driver_info = self.selected_driver
+            if not driver_info.has_extension(file_path.suffix.replace(".", "")):
+                file_path = file_path.parent / "{}.{}".format(file_path.stem, driver_info.extension)
             self._result_file_name = file_path.as_posix()
             self.file_name.setText(self._result_file_name)
         self.enable_ok()
@@ -84,3 +86,21 @@ class ExportLayerDialog(QDialog):
     @property
     def result_file_name(self) -> str:
         return self._result_file_name
+
+    @property
+    def selected_driver(self) -> DriverInfo:
+        return self.save_type.currentData(Qt.UserRole)
+
+    @property
+    def selected_driver_name(self) -> str:
+        return self.selected_driver.name
+
+    @property
+    def group_transactions_size(self) -> int:
+        return self.group_transactions.value()
+
+    @property
+    def layer_creation_options(self) -> List[str]:
+        if self.selected_driver.supports_layer_creation_option("SPATIAL_INDEX"):
+            return [f"SPATIAL_INDEX={'YES' if self.spatial_index.isChecked() else 'NO'}"]
+        return []
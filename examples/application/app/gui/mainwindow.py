@@ -1,5 +1,12 @@
-from PyQt5.QtWidgets import (QMainWindow, QDialog, QMenu, QAction, QApplication)
+from typing import Dict
+from functools import partial
 
+from PyQt5.QtWidgets import (QMainWindow, QDialog, QMenu, QAction, QApplication, QProgressDialog,
+                             QInputDialog)
+
+import numpy as np
+
+from .dialogs.batchexportdialog import BatchExportDialog
 from .dialogs.copydialog import CopyLayerDialog
 from .dialogs.deletedialog import DeleteLayersDialog
 from .dialogs.exportlayerdialog import ExportLayerDialog
@@ -21,6 +28,24 @@ class MainWindow(QMainWindow):
 
         self.main_widget = MainWidget(self._spatial_data, self)
         self._spatial_data.dataChanged.connect(self.enable_operations)
+        self._spatial_data.dataLoadingFinished.connect(self.enable_operations)
+        self._spatial_data.exportProgress.connect(self.export_progress)
+        self._spatial_data.exportFinished.connect(self.export_finished)
+        self._spatial_data.batchExportProgress.connect(self.batch_export_progress)
+        self._spatial_data.batchExportFinished.connect(self.batch_export_finished)
+        self._spatial_data.geometryValidationProgress.connect(self.geometry_validation_progress)
+        self._spatial_data.geometryValidationFinished.connect(self.geometry_validation_finished)
+        self._spatial_data.materializationProgress.connect(self.materialization_progress)
+        self._spatial_data.materializationThroughput.connect(self.materialization_throughput)
+        self._spatial_data.materializationFinished.connect(self.materialization_finished)
+        self._spatial_data.extractionProgress.connect(self.extraction_progress)
+        self._spatial_data.extractionFinished.connect(self.extraction_finished)
+
+        self._export_progress: Dict[str, QProgressDialog] = {}
+        self._batch_export_progress: QProgressDialog = None
+        self._geometry_validation_progress: QProgressDialog = None
+        self._materialization_progress: QProgressDialog = None
+        self._extraction_progress: QProgressDialog = None
 
         self.setCentralWidget(self.main_widget)
 
@@ -44,12 +69,31 @@ class MainWindow(QMainWindow):
         self.action_copy_layer_SQL.setEnabled(False)
         menu_operations.addAction(self.action_copy_layer_SQL)
 
+        self.action_extract_features = QAction("Vybrat prvky z výřezu mapy", self)
+        self.action_extract_features.setStatusTip(
+            "Zkopírovat prvky viditelné v záložce Mapa do nové vrstvy")
+        self.action_extract_features.triggered.connect(self.extract_features)
+        self.action_extract_features.setEnabled(False)
+        menu_operations.addAction(self.action_extract_features)
+
         self.action_export_layer = QAction("Exportovat vrstvu", self)
         self.action_export_layer.setStatusTip("Exportovat vrstvu do souboru")
         self.action_export_layer.triggered.connect(self.export_layer_to_file)
         self.action_export_layer.setEnabled(False)
         menu_operations.addAction(self.action_export_layer)
 
+        self.action_export_layers = QAction("Exportovat více vrstev", self)
+        self.action_export_layers.setStatusTip("Exportovat vybrané vrstvy do samostatných souborů")
+        self.action_export_layers.triggered.connect(self.export_layers_to_files)
+        self.action_export_layers.setEnabled(False)
+        menu_operations.addAction(self.action_export_layers)
+
+        self.action_validate_geometries = QAction("Zkontrolovat geometrie", self)
+        self.action_validate_geometries.setStatusTip("Zkontrolovat validitu geometrií vybrané vrstvy")
+        self.action_validate_geometries.triggered.connect(self.validate_geometries)
+        self.action_validate_geometries.setEnabled(False)
+        menu_operations.addAction(self.action_validate_geometries)
+
         self.action_delete_layer = QAction("Smazat vrstvy", self)
         self.action_delete_layer.setStatusTip("Smazat vrstvy z datového zdroje")
         self.action_delete_layer.triggered.connect(self.delete_layers)
@@ -58,8 +102,11 @@ class MainWindow(QMainWindow):
 
     def enable_operations(self):
         self.action_copy_layer_SQL.setEnabled(self._spatial_data.ds_allow_create_layer)
+        self.action_extract_features.setEnabled(self._spatial_data.ds_allow_create_layer)
         self.action_delete_layer.setEnabled(self._spatial_data.ds_allow_delete_layer)
         self.action_export_layer.setEnabled(self._spatial_data.is_vector)
+        self.action_export_layers.setEnabled(self._spatial_data.is_vector)
+        self.action_validate_geometries.setEnabled(self._spatial_data.is_vector)
 
     def copy_SQL_layer(self) -> None:
 
@@ -68,7 +115,100 @@ class MainWindow(QMainWindow):
         result = dialog.exec()
 
         if result == QDialog.Accepted:
-            self._spatial_data.sql_layer_to_layer(dialog.name_new_layer)
+            if not self._spatial_data.materialize_sql_async(dialog.sql, dialog.sql_flavor,
+                                                            dialog.name_new_layer):
+                self.showMessage(f"Data do vrstvy {dialog.name_new_layer} nelze zkopírovat.",
+                                 5000)
+                return
+
+            self.close_materialization_progress()
+            self._materialization_progress = QProgressDialog(
+                f"Kopíruji data do vrstvy {dialog.name_new_layer}...", "Zrušit", 0, 0, self)
+            self._materialization_progress.setWindowTitle("Kopírování dat")
+            self._materialization_progress.setMinimumDuration(0)
+            self._materialization_progress.canceled.connect(self.materialization_canceled)
+            self._materialization_progress.setValue(0)
+
+    def materialization_progress(self, layer_name: str, percent: float) -> None:
+        if self._materialization_progress:
+            self._materialization_progress.setMaximum(100)
+            self._materialization_progress.setValue(int(percent))
+
+    def materialization_throughput(self, layer_name: str, written: int,
+                                   features_per_second: float) -> None:
+        if self._materialization_progress:
+            self._materialization_progress.setLabelText(
+                f"Kopíruji data do vrstvy {layer_name}... "
+                f"{written} prvků ({features_per_second:.0f} prvků/s)")
+
+    def materialization_canceled(self) -> None:
+        self._spatial_data.cancel_materialization()
+        self._materialization_progress = None
+        self.showMessage("Kopírování dat zrušeno.")
+
+    def materialization_finished(self, layer_name: str, written: int, error: str) -> None:
+        self.close_materialization_progress()
+        if error:
+            self.showMessage(f"Kopírování do vrstvy {layer_name} selhalo: {error}", 5000)
+        else:
+            self.showMessage(f"Do vrstvy {layer_name} zkopírováno {written} prvků.", 5000)
+
+    def close_materialization_progress(self) -> None:
+        if self._materialization_progress:
+            self._materialization_progress.canceled.disconnect()
+            self._materialization_progress.close()
+            self._materialization_progress = None
+
+    def extract_features(self) -> None:
+        layer_name = self.main_widget.layer_selection.currentText()
+
+        if not layer_name:
+            return
+
+        extent = self.main_widget.vector_canvas.view_extent()
+        fids = self._spatial_data.query_features(layer_name, extent)
+
+        if fids is None:
+            self.showMessage("Prostorový index vrstvy se ještě vytváří.")
+            return
+
+        new_layer_name, ok = QInputDialog.getText(self, "Vybrat prvky z výřezu mapy",
+                                                  f"Název nové vrstvy ({len(fids)} prvků):")
+
+        if ok and new_layer_name:
+            if not self._spatial_data.extract_features_async(layer_name, fids, extent,
+                                                             new_layer_name):
+                self.showMessage(f"Prvky do vrstvy {new_layer_name} nelze vybrat.", 5000)
+                return
+
+            self.close_extraction_progress()
+            self._extraction_progress = QProgressDialog(
+                f"Vybírám prvky do vrstvy {new_layer_name}...", "Zrušit", 0, 100, self)
+            self._extraction_progress.setWindowTitle("Výběr prvků")
+            self._extraction_progress.setMinimumDuration(0)
+            self._extraction_progress.canceled.connect(self.extraction_canceled)
+
+    def extraction_progress(self, layer_name: str, percent: float) -> None:
+        if self._extraction_progress:
+            self._extraction_progress.setValue(int(percent))
+
+    def extraction_canceled(self) -> None:
+        self._spatial_data.cancel_extraction()
+        self._extraction_progress = None
+        self.showMessage("Výběr prvků zrušen.")
+
+    def extraction_finished(self, layer_name: str, written: int, error: str) -> None:
+        self.close_extraction_progress()
+        if error:
+            self.showMessage(f"Výběr prvků do vrstvy {layer_name} selhal: {error}", 5000)
+        else:
+            self.showMessage(f"Vrstva {layer_name} vytvořena ({written} prvků).", 5000)
+
+    def close_extraction_progress(self) -> None:
+        if self._extraction_progress:
+            self._extraction_progress.canceled.disconnect()
+            self._extraction_progress.close()
+            self._extraction_progress = None
 
     def delete_layers(self) -> None:
 
@@ -86,7 +226,122 @@ class MainWindow(QMainWindow):
         result = dialog.exec()
 
         if result == QDialog.Accepted:
-            self._spatial_data.export_layer(dialog.selected_layer, dialog.result_file_name)
+            file_name = dialog.result_file_name
+
+            progress = QProgressDialog(f"Exportuji vrstvu {dialog.selected_layer}...", "Zrušit", 0,
+                                       100, self)
+            progress.setWindowTitle("Export vrstvy")
+            progress.setMinimumDuration(0)
+            progress.canceled.connect(partial(self.export_canceled, file_name))
+            self._export_progress[file_name] = progress
+
+            self._spatial_data.export_layer_async(
+                dialog.selected_layer,
+                file_name,
+                driver_name=dialog.selected_driver_name,
+                group_transactions=dialog.group_transactions_size,
+                layer_creation_options=dialog.layer_creation_options)
+
+    def export_progress(self, file_name: str, percent: float) -> None:
+        progress = self._export_progress.get(file_name)
+        if progress:
+            progress.setValue(int(percent))
+
+    def export_canceled(self, file_name: str) -> None:
+        self._spatial_data.cancel_export(file_name)
+        self._export_progress.pop(file_name, None)
+        self.showMessage(f"Export do {file_name} zrušen.")
+
+    def export_finished(self, file_name: str, success: bool) -> None:
+        progress = self._export_progress.pop(file_name, None)
+        if progress:
+            progress.canceled.disconnect()
+            progress.close()
+        if success:
+            self.showMessage(f"Vrstva exportována do {file_name}.")
+        else:
+            self.showMessage(f"Export do {file_name} selhal.")
+
+    def export_layers_to_files(self) -> None:
+
+        dialog = BatchExportDialog(self._spatial_data)
+
+        result = dialog.exec()
+
+        if result == QDialog.Accepted:
+            layers = dialog.layers_to_export
+
+            self.close_batch_export_progress()
+            self._batch_export_progress = QProgressDialog(f"Exportuji 0 z {len(layers)} vrstev...",
+                                                          "Zrušit", 0, 100, self)
+            self._batch_export_progress.setWindowTitle("Export vrstev")
+            self._batch_export_progress.setMinimumDuration(0)
+            self._batch_export_progress.canceled.connect(self.batch_export_canceled)
+
+            self._spatial_data.export_layers(layers,
+                                             dialog.folder,
+                                             dialog.selected_driver_name,
+                                             dialog.selected_extension,
+                                             max_workers=dialog.max_workers,
+                                             group_transactions=dialog.group_transactions_size)
+
+    def batch_export_progress(self, done: int, total: int, percent: float) -> None:
+        if self._batch_export_progress:
+            self._batch_export_progress.setLabelText(f"Exportuji {done} z {total} vrstev...")
+            self._batch_export_progress.setValue(int(percent))
+
+    def batch_export_canceled(self) -> None:
+        self._spatial_data.cancel_batch_export()
+        self._batch_export_progress = None
+        self.showMessage("Export vrstev zrušen.")
+
+    def batch_export_finished(self, succeeded: int, failed: int) -> None:
+        self.close_batch_export_progress()
+        self.showMessage(f"Exportováno {succeeded} vrstev, {failed} selhalo.", 5000)
+
+    def close_batch_export_progress(self) -> None:
+        if self._batch_export_progress:
+            self._batch_export_progress.canceled.disconnect()
+            self._batch_export_progress.close()
+            self._batch_export_progress = None
+
+    def validate_geometries(self) -> None:
+        layer_name = self.main_widget.layer_selection.currentText()
+
+        if not layer_name:
+            return
+
+        self.close_geometry_validation_progress()
+        self._geometry_validation_progress = QProgressDialog(
+            f"Kontroluji geometrie vrstvy {layer_name}...", "Zrušit", 0, 100, self)
+        self._geometry_validation_progress.setWindowTitle("Kontrola geometrií")
+        self._geometry_validation_progress.setMinimumDuration(0)
+        self._geometry_validation_progress.canceled.connect(self.geometry_validation_canceled)
+
+        self._spatial_data.validate_geometries_async(layer_name)
+
+    def geometry_validation_progress(self, layer_name: str, percent: float) -> None:
+        if self._geometry_validation_progress:
+            self._geometry_validation_progress.setValue(int(percent))
+
+    def geometry_validation_canceled(self) -> None:
+        self._spatial_data.cancel_geometry_validation()
+        self._geometry_validation_progress = None
+        self.showMessage("Kontrola geometrií zrušena.")
+
+    def geometry_validation_finished(self, layer_name: str, invalid_fids: np.ndarray) -> None:
+        self.close_geometry_validation_progress()
+        if invalid_fids is None:
+            self.showMessage(f"Kontrola geometrií vrstvy {layer_name} selhala.", 5000)
+            return
+        self.showMessage(f"Vrstva {layer_name} obsahuje {len(invalid_fids)} nevalidních geometrií.",
+                         5000)
+
+    def close_geometry_validation_progress(self) -> None:
+        if self._geometry_validation_progress:
+            self._geometry_validation_progress.canceled.disconnect()
+            self._geometry_validation_progress.close()
+            self._geometry_validation_progress = None
 
     def showMessage(self, msg: str, timeout: int = 2000) -> None:
         self.statusBar().showMessage(msg, timeout)
@@ -2,18 +2,27 @@ from typing import Optional
 from enum import Enum
 
 from PyQt5.QtWidgets import (QWidget, QTabWidget, QFormLayout, QLineEdit, QListWidget, QComboBox,
-                             QVBoxLayout, QListWidgetItem)
+                             QVBoxLayout, QHBoxLayout, QListWidgetItem, QProgressBar, QPushButton,
+                             QTableView, QTableWidget, QTableWidgetItem)
 from PyQt5.QtCore import pyqtSignal
 
 from .fileselect import FileSelectWidget
+from .rasterview import RasterViewWidget
+from .vectorcanvas import VectorCanvasWidget
 from ...model.enums import DataType
 from ...model.data import SpatialData
+from ...model.featuretablemodel import FeatureTableModel
+from ...model.rasterstats import BandStatistics
 from ...settings.appsettings import ApplicationSettings
 
 
 class Tabs(Enum):
     DATASOURCE = 0
     LAYER = 1
+    FEATURES = 2
+    BANDS = 3
+    PREVIEW = 4
+    MAP = 5
 
 
 class MainWidget(QWidget):
@@ -21,6 +30,8 @@ class MainWidget(QWidget):
     dataSourceLoaded = pyqtSignal()
 
     text_not_identified = "Neidentifikován!"
+    text_counting = "Počítá se..."
+    text_count_unknown = "Nelze zjistit"
 
     def __init__(self, spatial_data: SpatialData, parent: Optional['QWidget'] = None) -> None:
         super().__init__(parent)
@@ -29,6 +40,14 @@ class MainWidget(QWidget):
         self._spatial_data.dataChanged.connect(self.set_datasource_info)
         self._spatial_data.layersChanged.connect(self.set_layers)
         self._spatial_data.layersChanged.connect(self.set_datasource_info)
+        self._spatial_data.dataLoadingStarted.connect(self.show_loading)
+        self._spatial_data.dataLoadingProgress.connect(self.set_loading_progress)
+        self._spatial_data.dataLoadingFinished.connect(self.hide_loading)
+        self._spatial_data.dataLoadingCanceled.connect(self.hide_loading)
+        self._spatial_data.featureCountChanged.connect(self.update_feature_count)
+        self._spatial_data.spatialIndexReady.connect(self.set_spatial_index)
+        self._spatial_data.rasterStatisticsUpdated.connect(self.set_band_statistics)
+        self._spatial_data.rasterStatisticsProgress.connect(self.set_band_statistics_progress)
 
         layout = QVBoxLayout()
         self.setLayout(layout)
@@ -38,7 +57,17 @@ class MainWidget(QWidget):
 
         self.tabs.addTab(self.create_tab_datasource(), "Zdroj dat")
         self.tabs.addTab(self.create_tab_layers(), "Vrstvy")
+        self.tabs.addTab(self.create_tab_features(), "Prvky")
+        self.tabs.addTab(self.create_tab_bands(), "Pásma")
+        self.raster_view = RasterViewWidget(self.tabs)
+        self.tabs.addTab(self.raster_view, "Náhled")
+        self.vector_canvas = VectorCanvasWidget(self.tabs)
+        self.tabs.addTab(self.vector_canvas, "Mapa")
         self.tabs.setTabEnabled(Tabs.LAYER.value, False)
+        self.tabs.setTabEnabled(Tabs.FEATURES.value, False)
+        self.tabs.setTabEnabled(Tabs.BANDS.value, False)
+        self.tabs.setTabEnabled(Tabs.PREVIEW.value, False)
+        self.tabs.setTabEnabled(Tabs.MAP.value, False)
 
         self.settings = ApplicationSettings()
 
@@ -49,7 +78,21 @@ class MainWidget(QWidget):
         self.widget_datasource.setLayout(layout)
 
         self.file_select = FileSelectWidget(self)
-        self.file_select.fileSelected.connect(self._spatial_data.read_data)
+        self.file_select.fileSelected.connect(self._spatial_data.read_data_async)
+        self.file_select.fileCleared.connect(self._spatial_data.cancel_read_data)
+
+        self.loading_progress = QProgressBar(self)
+        self.loading_progress.setMaximum(100)
+
+        self.loading_cancel = QPushButton("Zrušit", self)
+        self.loading_cancel.clicked.connect(self._spatial_data.cancel_read_data)
+
+        self.widget_loading = QWidget(self)
+        layout_loading = QHBoxLayout(self.widget_loading)
+        layout_loading.setContentsMargins(0, 0, 0, 0)
+        layout_loading.addWidget(self.loading_progress)
+        layout_loading.addWidget(self.loading_cancel)
+        self.widget_loading.setVisible(False)
 
         self.driver_name = QLineEdit(self)
         self.driver_name.setReadOnly(True)
@@ -60,6 +103,7 @@ class MainWidget(QWidget):
         self.elements_count.setText("0")
 
         layout.addRow("Zvolte soubor:", self.file_select)
+        layout.addRow(self.widget_loading)
         layout.addRow("Identifikovaný GDAL/OGR driver:", self.driver_name)
         layout.addRow("Počet vrstev v datové sadě:", self.elements_count)
 
@@ -92,33 +136,133 @@ class MainWidget(QWidget):
 
         return self.widget_layers
 
+    def show_loading(self) -> None:
+        self.loading_progress.setValue(0)
+        self.widget_loading.setVisible(True)
+
+    def set_loading_progress(self, percent: float) -> None:
+        self.loading_progress.setValue(int(percent))
+
+    def hide_loading(self) -> None:
+        self.widget_loading.setVisible(False)
+
+    def create_tab_features(self) -> QWidget:
+
+        self.widget_features = QWidget(self.tabs)
+        layout = QVBoxLayout()
+        self.widget_features.setLayout(layout)
+
+        self.features_model = FeatureTableModel(self)
+        self.features_table = QTableView(self.widget_features)
+        self.features_table.setModel(self.features_model)
+
+        layout.addWidget(self.features_table)
+
+        return self.widget_features
+
+    def create_tab_bands(self) -> QWidget:
+
+        self.widget_bands = QWidget(self.tabs)
+        layout = QVBoxLayout()
+        self.widget_bands.setLayout(layout)
+
+        self.bands_statistics_progress = QProgressBar(self.widget_bands)
+        self.bands_statistics_progress.setMaximum(100)
+
+        self.bands_statistics = QTableWidget(self.widget_bands)
+        self.bands_statistics.setColumnCount(5)
+        self.bands_statistics.setHorizontalHeaderLabels(
+            ["Pásmo", "Minimum", "Maximum", "Průměr", "Směr. odchylka"])
+
+        layout.addWidget(self.bands_statistics_progress)
+        layout.addWidget(self.bands_statistics)
+
+        return self.widget_bands
+
     def set_datasource_info(self) -> None:
         self.driver_name.setText(self._spatial_data.driver_name)
         if self._spatial_data.data_type == DataType.VECTOR:
             self.tabs.setTabEnabled(Tabs.LAYER.value, True)
+            self.tabs.setTabEnabled(Tabs.FEATURES.value, True)
+            self.tabs.setTabEnabled(Tabs.BANDS.value, False)
+            self.tabs.setTabEnabled(Tabs.PREVIEW.value, False)
+            self.tabs.setTabEnabled(Tabs.MAP.value, True)
+            self.raster_view.clear()
             self.elements_count.setText(f"{len(self._spatial_data.layers_names)} vrstvy/vrstev")
             self.set_layers()
         if self._spatial_data.data_type == DataType.RASTER:
             self.tabs.setTabEnabled(Tabs.LAYER.value, False)
-            self.elements_count.setText(
-                f"{len(self._spatial_data.layers_names)} pásem")  # TODO fix
+            self.tabs.setTabEnabled(Tabs.FEATURES.value, False)
+            self.tabs.setTabEnabled(Tabs.BANDS.value, True)
+            self.tabs.setTabEnabled(Tabs.PREVIEW.value, True)
+            self.tabs.setTabEnabled(Tabs.MAP.value, False)
+            self.features_model.clear()
+            self.vector_canvas.clear()
+            self.raster_view.set_dataset(self._spatial_data.path_data)
+            self.elements_count.setText(f"{self._spatial_data.raster_band_count} pásem")
+            self.bands_statistics.setRowCount(self._spatial_data.raster_band_count)
+            self.bands_statistics.clearContents()
+            self.bands_statistics_progress.setValue(0)
+            self._spatial_data.compute_raster_statistics()
+
+    def set_band_statistics(self, band: int, statistics: BandStatistics) -> None:
+        row = band - 1
+        values = [band, statistics.minimum, statistics.maximum, statistics.mean, statistics.std]
+        for column, value in enumerate(values):
+            self.bands_statistics.setItem(row, column, QTableWidgetItem(f"{value:g}"))
+
+    def set_band_statistics_progress(self, percent: float) -> None:
+        self.bands_statistics_progress.setValue(int(percent))
 
     def get_layer_info(self):
         layer_name = self.layer_selection.currentText()
         if layer_name != "":
             self.set_crs(layer_name)
-            self.feature_count.setText(str(self._spatial_data.read_feature_count(layer_name)))
+            self.set_feature_count(layer_name)
             self.set_fields(layer_name)
+            self.features_model.set_layer(self._spatial_data.path_data, layer_name)
+            self.vector_canvas.set_layer(self._spatial_data.path_data, layer_name)
+            self.vector_canvas.set_spatial_index(self._spatial_data.spatial_index(layer_name))
+            self._spatial_data.build_spatial_index_async(layer_name)
         else:
+            self.features_model.clear()
+            self.vector_canvas.clear()
             self.crs_name.setText("")
             self.feature_count.setText("")
             self.fields.clear()
 
+    def set_spatial_index(self, layer_name: str) -> None:
+        if layer_name == self.layer_selection.currentText():
+            self.vector_canvas.set_spatial_index(self._spatial_data.spatial_index(layer_name))
+
     def set_layers(self) -> None:
         self.layer_selection.clear()
         self.layer_selection.addItem("")
         self.layer_selection.addItems(self._spatial_data.layers_names)
 
+    def set_feature_count(self, layer_name: str) -> None:
+        count = self._spatial_data.read_feature_count(layer_name)
+
+        if self._spatial_data.is_feature_count_exact(layer_name):
+            self.feature_count.setText(str(count))
+        else:
+            if count < 0:
+                self.feature_count.setText(self.text_counting)
+            else:
+                self.feature_count.setText(f"~{count}")
+            self._spatial_data.count_features_async(layer_name)
+
+    def update_feature_count(self, layer_name: str, count: int) -> None:
+        if layer_name == self.layer_selection.currentText():
+            if count < 0:
+                approximate = self._spatial_data.read_feature_count(layer_name)
+                if approximate < 0:
+                    self.feature_count.setText(self.text_count_unknown)
+                else:
+                    self.feature_count.setText(f"~{approximate}")
+            else:
+                self.feature_count.setText(str(count))
+
     def set_crs(self, layer_name: str) -> None:
         crs = self._spatial_data.identify_crs(layer_name)
         if crs is None:
@@ -0,0 +1,348 @@
+from collections import OrderedDict
+from functools import partial
+from typing import Dict, List, Optional, Tuple, Union
+import math
+
+import numpy as np
+
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QPoint, QPointF, QRectF, QThreadPool
+from PyQt5.QtGui import (QPainter, QPaintEvent, QImage, QPixmap, QColor, QMouseEvent, QWheelEvent,
+                         QResizeEvent)
+
+from osgeo import gdal
+
+from ...model.handlepool import handle_pool
+from ...model.rasterstats import histogram_range
+from ...model.workers import Worker
+
+TileKey = Tuple[int, int, int]
+Size = Tuple[int, int]
+RasterInfo = Tuple[Size, List[int], List[Tuple[float, float]], List[Size]]
+
+
+class RasterTileWorker(Worker):
+
+    def __init__(self, path: str, key: TileKey, tile_size: int, level_size: Size,
+                 bands: List[int], value_ranges: List[Tuple[float, float]]) -> None:
+        super().__init__()
+        self.path = path
+        self.key = key
+        self.tile_size = tile_size
+        self.level_size = level_size
+        self.bands = bands
+        self.value_ranges = value_ranges
+
+    def _window(self) -> Tuple[int, int, int, int]:
+        _, tile_x, tile_y = self.key
+        level_width, level_height = self.level_size
+
+        x_off = tile_x * self.tile_size
+        y_off = tile_y * self.tile_size
+        return (x_off, y_off, min(self.tile_size, level_width - x_off),
+                min(self.tile_size, level_height - y_off))
+
+    def _read_band(self, ds: gdal.Dataset, band_number: int) -> Optional[np.ndarray]:
+        level = self.key[0]
+        x_off, y_off, width, height = self._window()
+        if width <= 0 or height <= 0:
+            return None
+
+        band: gdal.Band = ds.GetRasterBand(band_number)
+        if 0 < level <= band.GetOverviewCount():
+            band = band.GetOverview(level - 1)
+
+        level_width, level_height = self.level_size
+        scale_x = band.XSize / level_width
+        scale_y = band.YSize / level_height
+
+        band_x = min(int(x_off * scale_x), band.XSize)
+        band_y = min(int(y_off * scale_y), band.YSize)
+        band_width = min(max(1, round(width * scale_x)), band.XSize - band_x)
+        band_height = min(max(1, round(height * scale_y)), band.YSize - band_y)
+        if band_width <= 0 or band_height <= 0:
+            return None
+
+        return band.ReadAsArray(band_x, band_y, band_width, band_height,
+                                buf_xsize=width, buf_ysize=height)
+
+    def run(self) -> None:
+        if self.is_canceled:
+            self.signal.canceled.emit()
+            return
+
+        channels = []
+        with handle_pool().reader(self.path) as ds:
+            if ds is None:
+                self.signal.finished.emit()
+                return
+
+            for band_number, (minimum, maximum) in zip(self.bands, self.value_ranges):
+                if self.is_canceled:
+                    self.signal.canceled.emit()
+                    return
+                values = self._read_band(ds, band_number)
+                if values is None:
+                    self.signal.finished.emit()
+                    return
+                values = values.astype(np.float32)
+                values = (values - minimum) * (255 / (maximum - minimum))
+                channels.append(np.clip(values, 0, 255).astype(np.uint8))
+
+        if len(channels) == 3:
+            pixels = np.ascontiguousarray(np.dstack(channels))
+            image_format = QImage.Format_RGB888
+        else:
+            pixels = np.ascontiguousarray(channels[0])
+            image_format = QImage.Format_Grayscale8
+
+        height, width = pixels.shape[:2]
+        image = QImage(pixels.data, width, height, pixels.strides[0], image_format).copy()
+
+        self.signal.result.emit((self.key, image))
+        self.signal.finished.emit()
+
+
+class RasterInfoWorker(Worker):
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+
+    def run(self) -> None:
+        with handle_pool().reader(self.path) as ds:
+            if ds is None or ds.RasterCount == 0:
+                self.signal.finished.emit()
+                return
+
+            bands = [1, 2, 3] if ds.RasterCount >= 3 else [1]
+            value_ranges = []
+            for band in bands:
+                if self.is_canceled:
+                    self.signal.canceled.emit()
+                    return
+                value_ranges.append(histogram_range(ds.GetRasterBand(band)))
+
+            size = (ds.RasterXSize, ds.RasterYSize)
+
+            first_band: gdal.Band = ds.GetRasterBand(bands[0])
+            levels = [size]
+            for i in range(first_band.GetOverviewCount()):
+                overview: gdal.Band = first_band.GetOverview(i)
+                if overview.XSize > 0 and overview.YSize > 0:
+                    levels.append((overview.XSize, overview.YSize))
+
+        self.signal.result.emit((size, bands, value_ranges, levels))
+        self.signal.finished.emit()
+
+
+class RasterViewWidget(QWidget):
+
+    tile_size = 256
+    cache_bytes = 256 * 1024 * 1024
+    zoom_step = 1.25
+
+    def __init__(self,
+                 parent: Optional[QWidget] = None,
+                 flags: Union[Qt.WindowFlags, Qt.WindowType] = Qt.WindowType.Widget) -> None:
+        super().__init__(parent, flags)
+
+        self._threadpool = QThreadPool()
+
+        self._info_worker: RasterInfoWorker = None
+        self._path: str = None
+        self._size: Tuple[int, int] = (0, 0)
+        self._levels: List[Size] = []
+        self._bands: List[int] = []
+        self._value_ranges: List[Tuple[float, float]] = []
+
+        self._center = QPointF()
+        self._scale = 1.0
+
+        self._tiles: 'OrderedDict[TileKey, QPixmap]' = OrderedDict()
+        self._tiles_bytes = 0
+        self._pending: Dict[TileKey, RasterTileWorker] = {}
+
+        self._drag_start: QPoint = None
+
+        self.setMinimumSize(200, 200)
+
+    def set_dataset(self, path: str) -> None:
+        self.clear()
+        self.update()
+
+        if not path:
+            return
+
+        worker = RasterInfoWorker(path)
+        worker.signal.result.connect(partial(self._dataset_ready, worker))
+        self._info_worker = worker
+        self._threadpool.start(worker)
+
+    def _dataset_ready(self, worker: RasterInfoWorker, result: RasterInfo) -> None:
+        if worker is not self._info_worker:
+            return
+
+        self._info_worker = None
+        self._path = worker.path
+        self._size, self._bands, self._value_ranges, self._levels = result
+
+        self.zoom_to_full_extent()
+
+    def clear(self) -> None:
+        if self._info_worker:
+            self._info_worker.cancel()
+            self._info_worker = None
+        self._cancel_pending(set())
+        self._path = None
+        self._size = (0, 0)
+        self._levels = []
+        self._bands = []
+        self._value_ranges = []
+        self._tiles.clear()
+        self._tiles_bytes = 0
+
+    def zoom_to_full_extent(self) -> None:
+        width, height = self._size
+        if width and height and self.width() and self.height():
+            self._center = QPointF(width / 2, height / 2)
+            self._scale = max(width / self.width(), height / self.height())
+        self.update()
+
+    def _level_factors(self, level: int) -> Tuple[float, float]:
+        width, height = self._size
+        level_width, level_height = self._levels[level]
+        return width / level_width, height / level_height
+
+    def _level_for_scale(self) -> int:
+        level = 0
+        for i in range(len(self._levels)):
+            factor = min(self._level_factors(i))
+            if factor <= self._scale and factor >= min(self._level_factors(level)):
+                level = i
+        return level
+
+    def _visible_tiles(self, level: int) -> List[Tuple[TileKey, QRectF]]:
+        factor_x, factor_y = self._level_factors(level)
+        tile_extent_x = self.tile_size * factor_x
+        tile_extent_y = self.tile_size * factor_y
+        level_width, level_height = self._levels[level]
+
+        left = self._center.x() - self.width() / 2 * self._scale
+        top = self._center.y() - self.height() / 2 * self._scale
+        right = self._center.x() + self.width() / 2 * self._scale
+        bottom = self._center.y() + self.height() / 2 * self._scale
+
+        width, height = self._size
+        first_x = max(0, int(left // tile_extent_x))
+        first_y = max(0, int(top // tile_extent_y))
+        last_x = min(math.ceil(level_width / self.tile_size), math.ceil(right / tile_extent_x))
+        last_y = min(math.ceil(level_height / self.tile_size), math.ceil(bottom / tile_extent_y))
+
+        tiles = []
+        for tile_y in range(first_y, last_y):
+            for tile_x in range(first_x, last_x):
+                x = tile_x * tile_extent_x
+                y = tile_y * tile_extent_y
+                tile_width = min(tile_extent_x, width - x)
+                tile_height = min(tile_extent_y, height - y)
+                if tile_width <= 0 or tile_height <= 0:
+                    continue
+                screen = QRectF((x - left) / self._scale, (y - top) / self._scale,
+                                tile_width / self._scale, tile_height / self._scale)
+                tiles.append(((level, tile_x, tile_y), screen))
+        return tiles
+
+    def _request_tile(self, key: TileKey) -> None:
+        if key in self._pending:
+            return
+
+        worker = RasterTileWorker(self._path, key, self.tile_size, self._levels[key[0]],
+                                  self._bands, self._value_ranges)
+        worker.signal.result.connect(partial(self._tile_ready, worker))
+        self._pending[key] = worker
+        self._threadpool.start(worker)
+
+    def _cancel_pending(self, keep: set) -> None:
+        for key in list(self._pending.keys()):
+            if key not in keep:
+                self._pending.pop(key).cancel()
+
+    def _tile_ready(self, worker: RasterTileWorker, result: Tuple[TileKey, QImage]) -> None:
+        key, image = result
+
+        if self._pending.get(key) is not worker:
+            return
+
+        del self._pending[key]
+
+        pixmap = QPixmap.fromImage(image)
+        self._tiles[key] = pixmap
+        self._tiles_bytes += pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+        while self._tiles_bytes > self.cache_bytes and len(self._tiles) > 1:
+            _, evicted = self._tiles.popitem(last=False)
+            self._tiles_bytes -= evicted.width() * evicted.height() * evicted.depth() // 8
+
+        self.update()
+
+    def paintEvent(self, e: QPaintEvent):
+
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#202020"))
+
+        if not self._path:
+            return
+
+        level = self._level_for_scale()
+        visible = self._visible_tiles(level)
+        self._cancel_pending({key for key, _ in visible})
+
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+
+        for key, screen in visible:
+            pixmap = self._tiles.get(key)
+            if pixmap:
+                self._tiles.move_to_end(key)
+                painter.drawPixmap(screen, pixmap, QRectF(pixmap.rect()))
+            else:
+                self._request_tile(key)
+
+    def resizeEvent(self, a0: QResizeEvent) -> None:
+        if self._path and a0.oldSize().width() <= 0:
+            self.zoom_to_full_extent()
+        return super().resizeEvent(a0)
+
+    def wheelEvent(self, a0: QWheelEvent) -> None:
+        if not self._path:
+            return
+
+        position = a0.position()
+        before = QPointF(self._center.x() + (position.x() - self.width() / 2) * self._scale,
+                         self._center.y() + (position.y() - self.height() / 2) * self._scale)
+
+        if a0.angleDelta().y() > 0:
+            self._scale /= self.zoom_step
+        else:
+            self._scale *= self.zoom_step
+
+        self._center = QPointF(before.x() - (position.x() - self.width() / 2) * self._scale,
+                               before.y() - (position.y() - self.height() / 2) * self._scale)
+        self.update()
+
+    def mousePressEvent(self, a0: QMouseEvent) -> None:
+        if a0.button() == Qt.MouseButton.LeftButton:
+            self._drag_start = a0.pos()
+
+    def mouseMoveEvent(self, a0: QMouseEvent) -> None:
+        if self._drag_start is not None:
+            delta = a0.pos() - self._drag_start
+            self._drag_start = a0.pos()
+            self._center -= QPointF(delta.x() * self._scale, delta.y() * self._scale)
+            self.update()
+
+    def mouseReleaseEvent(self, a0: QMouseEvent) -> None:
+        self._drag_start = None
+
+    def mouseDoubleClickEvent(self, a0: QMouseEvent) -> None:
+        self.zoom_to_full_extent()
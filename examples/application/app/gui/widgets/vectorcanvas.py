@@ -0,0 +1,401 @@
+from functools import partial
+from typing import List, Optional, Tuple, Union
+
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QPoint, QPointF, QThreadPool, QTimer
+from PyQt5.QtGui import (QPainter, QPaintEvent, QPainterPath, QColor, QBrush, QPen, QTransform,
+                         QMouseEvent, QWheelEvent, QResizeEvent, QShowEvent)
+
+import numpy as np
+
+from osgeo import ogr
+
+from ...model.handlepool import handle_pool
+from ...model.spatialindex import STRTree
+from ...model.workers import Worker
+
+Extent = Tuple[float, float, float, float]
+
+
+def add_geometry_to_paths(geometry: ogr.Geometry, polygons: QPainterPath, lines: QPainterPath,
+                          points: QPainterPath, point_size: float) -> None:
+
+    geometry_type = ogr.GT_Flatten(geometry.GetGeometryType())
+
+    if geometry_type == ogr.wkbPoint:
+        points.addEllipse(QPointF(geometry.GetX(), geometry.GetY()), point_size, point_size)
+
+    elif geometry_type == ogr.wkbLineString:
+        add_points_to_path(geometry.GetPoints(), lines, False)
+
+    elif geometry_type == ogr.wkbPolygon:
+        for i in range(geometry.GetGeometryCount()):
+            add_points_to_path(geometry.GetGeometryRef(i).GetPoints(), polygons, True)
+
+    else:
+        for i in range(geometry.GetGeometryCount()):
+            add_geometry_to_paths(geometry.GetGeometryRef(i), polygons, lines, points, point_size)
+
+
+def add_points_to_path(coordinates: List[Tuple[float, ...]], path: QPainterPath,
+                       closed: bool) -> None:
+    if not coordinates:
+        return
+
+    path.moveTo(coordinates[0][0], coordinates[0][1])
+    for coordinate in coordinates[1:]:
+        path.lineTo(coordinate[0], coordinate[1])
+
+    if closed:
+        path.closeSubpath()
+
+
+class VectorRenderWorker(Worker):
+
+    def __init__(self,
+                 path: str,
+                 layer_name: str,
+                 extent: Extent,
+                 tolerance: float,
+                 fids: np.ndarray = None,
+                 batch_size: int = 2000) -> None:
+        super().__init__()
+        self.path = path
+        self.layer_name = layer_name
+        self.extent = extent
+        self.tolerance = tolerance
+        self.fids = fids
+        self.batch_size = batch_size
+
+    def run(self) -> None:
+        with handle_pool().reader(self.path) as ds:
+            layer: ogr.Layer = ds.GetLayerByName(self.layer_name) if ds else None
+            self._render(layer)
+
+    def _render(self, layer: ogr.Layer) -> None:
+        if layer is None:
+            self.signal.finished.emit()
+            return
+
+        fids = self.fids
+        if fids is not None and not layer.TestCapability(ogr.OLCRandomRead):
+            fids = None
+
+        if fids is None:
+            min_x, min_y, max_x, max_y = self.extent
+            layer.SetSpatialFilterRect(min_x, min_y, max_x, max_y)
+
+        layer.SetIgnoredFields([
+            layer.GetLayerDefn().GetFieldDefn(i).GetName()
+            for i in range(layer.GetLayerDefn().GetFieldCount())
+        ] + ["OGR_STYLE"])
+
+        polygons, lines, points = QPainterPath(), QPainterPath(), QPainterPath()
+        features_in_batch = 0
+
+        for feature in self._features(layer, fids):
+            if self.is_canceled:
+                self.signal.canceled.emit()
+                return
+
+            geometry: ogr.Geometry = feature.GetGeometryRef()
+            if geometry:
+                simplified = geometry.Simplify(self.tolerance)
+                if simplified is None or simplified.IsEmpty():
+                    simplified = geometry
+                add_geometry_to_paths(simplified, polygons, lines, points, self.tolerance * 2)
+                features_in_batch += 1
+
+            if features_in_batch == self.batch_size:
+                self.signal.result.emit((polygons, lines, points))
+                polygons, lines, points = QPainterPath(), QPainterPath(), QPainterPath()
+                features_in_batch = 0
+
+        if features_in_batch:
+            self.signal.result.emit((polygons, lines, points))
+
+        self.signal.finished.emit()
+
+    def _features(self, layer: ogr.Layer, fids: np.ndarray):
+        if fids is not None:
+            for fid in fids.tolist():
+                feature = layer.GetFeature(fid)
+                if feature is not None:
+                    yield feature
+            return
+
+        feature: ogr.Feature = layer.GetNextFeature()
+        while feature is not None:
+            yield feature
+            feature = layer.GetNextFeature()
+
+
+class LayerExtentWorker(Worker):
+
+    def __init__(self, path: str, layer_name: str) -> None:
+        super().__init__()
+        self.path = path
+        self.layer_name = layer_name
+
+    def run(self) -> None:
+        with handle_pool().reader(self.path) as ds:
+            layer: ogr.Layer = ds.GetLayerByName(self.layer_name) if ds else None
+
+            if layer is None or layer.GetGeomType() == ogr.wkbNone:
+                self.signal.finished.emit()
+                return
+
+            extent = None
+            if layer.TestCapability(ogr.OLCFastGetExtent):
+                min_x, max_x, min_y, max_y = layer.GetExtent(force=0)
+                if min_x <= max_x and min_y <= max_y:
+                    extent = (min_x, min_y, max_x, max_y)
+
+        if self.is_canceled:
+            self.signal.canceled.emit()
+            return
+
+        self.signal.result.emit(extent)
+        self.signal.finished.emit()
+
+
+class VectorCanvasWidget(QWidget):
+
+    zoom_step = 1.25
+    render_delay = 100
+
+    def __init__(self,
+                 parent: Optional[QWidget] = None,
+                 flags: Union[Qt.WindowFlags, Qt.WindowType] = Qt.WindowType.Widget) -> None:
+        super().__init__(parent, flags)
+
+        self._threadpool = QThreadPool()
+        self._threadpool.setMaxThreadCount(1)
+
+        self._path: str = None
+        self._layer_name: str = None
+        self._extent: Extent = None
+        self._spatial_index: STRTree = None
+
+        self._center = QPointF()
+        self._scale = 1.0
+
+        self._paths: List[Tuple[QPainterPath, QPainterPath, QPainterPath]] = []
+        self._new_paths: List[Tuple[QPainterPath, QPainterPath, QPainterPath]] = None
+        self._worker: VectorRenderWorker = None
+        self._extent_worker: LayerExtentWorker = None
+
+        self._brush_polygon = QBrush(QColor("#a6cee3"))
+        self._brush_point = QBrush(QColor("#e31a1c"))
+        self._pen = QPen(QColor("#1f78b4"))
+        self._pen.setCosmetic(True)
+
+        self._drag_start: QPoint = None
+
+        self.render_timer = QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.setInterval(self.render_delay)
+        self.render_timer.timeout.connect(self.start_render)
+
+        self.setMinimumSize(200, 200)
+
+    def set_layer(self, path: str, layer_name: str) -> None:
+        self.clear()
+        self.update()
+
+        if not path or not layer_name:
+            return
+
+        worker = LayerExtentWorker(path, layer_name)
+        worker.signal.result.connect(partial(self._layer_ready, worker))
+        self._extent_worker = worker
+        self._threadpool.start(worker)
+
+    def _layer_ready(self, worker: 'LayerExtentWorker', extent: Optional[Extent]) -> None:
+        if worker is not self._extent_worker:
+            return
+
+        self._extent_worker = None
+        self._path = worker.path
+        self._layer_name = worker.layer_name
+        self._extent = extent
+
+        if self._extent is None and self._spatial_index is not None:
+            self._extent = self._spatial_index.extent
+
+        self.zoom_to_full_extent()
+
+    def clear(self) -> None:
+        if self._extent_worker:
+            self._extent_worker.cancel()
+            self._extent_worker = None
+        self._cancel_render()
+        self._path = None
+        self._layer_name = None
+        self._extent = None
+        self._spatial_index = None
+        self._paths = []
+        self._new_paths = None
+
+    def set_spatial_index(self, spatial_index: STRTree) -> None:
+        self._spatial_index = spatial_index
+        if self._path:
+            if self._extent is None and spatial_index is not None:
+                self._extent = spatial_index.extent
+                self.zoom_to_full_extent()
+            else:
+                self.view_changed()
+
+    def zoom_to_full_extent(self) -> None:
+        if self._extent and self.width() and self.height():
+            min_x, min_y, max_x, max_y = self._extent
+            self._center = QPointF((min_x + max_x) / 2, (min_y + max_y) / 2)
+            self._scale = max((max_x - min_x) / self.width(), (max_y - min_y) / self.height(),
+                              1e-9)
+        self.view_changed()
+
+    def view_changed(self) -> None:
+        self._cancel_render()
+        self.render_timer.start()
+        self.update()
+
+    def view_extent(self) -> Extent:
+        half_width = self.width() / 2 * self._scale
+        half_height = self.height() / 2 * self._scale
+        return (self._center.x() - half_width, self._center.y() - half_height,
+                self._center.x() + half_width, self._center.y() + half_height)
+
+    def map_to_screen(self) -> QTransform:
+        transform = QTransform()
+        transform.translate(self.width() / 2, self.height() / 2)
+        transform.scale(1 / self._scale, -1 / self._scale)
+        transform.translate(-self._center.x(), -self._center.y())
+        return transform
+
+    def _cancel_render(self) -> None:
+        self.render_timer.stop()
+        if self._worker:
+            self._worker.cancel()
+            self._worker = None
+
+    def start_render(self) -> None:
+        self._cancel_render()
+
+        if not self._path:
+            return
+
+        if not self.isVisible():
+            return
+
+        extent = self.view_extent()
+
+        fids = None
+        if self._spatial_index is not None:
+            fids = self._spatial_index.query(extent)
+            if len(fids) == 0:
+                self._paths = []
+                self._new_paths = None
+                self.update()
+                return
+            if len(fids) > len(self._spatial_index) // 2:
+                fids = None
+            else:
+                fids = np.sort(fids)
+
+        worker = VectorRenderWorker(self._path, self._layer_name, extent, self._scale, fids)
+        worker.signal.result.connect(partial(self._batch_rendered, worker))
+        worker.signal.finished.connect(partial(self._render_finished, worker))
+
+        self._worker = worker
+        self._new_paths = []
+        self._threadpool.start(worker)
+
+    def _batch_rendered(self, worker: VectorRenderWorker,
+                        paths: Tuple[QPainterPath, QPainterPath, QPainterPath]) -> None:
+        if worker is not self._worker:
+            return
+
+        if self._new_paths is not None:
+            self._paths = self._new_paths
+            self._new_paths = None
+
+        self._paths.append(paths)
+        self.update()
+
+    def _render_finished(self, worker: VectorRenderWorker) -> None:
+        if worker is not self._worker:
+            return
+
+        if self._new_paths is not None:
+            self._paths = self._new_paths
+            self._new_paths = None
+
+        self._worker = None
+        self.update()
+
+    def paintEvent(self, e: QPaintEvent):
+
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#ffffff"))
+
+        if not self._path:
+            return
+
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setTransform(self.map_to_screen())
+        painter.setPen(self._pen)
+
+        for polygons, lines, points in self._paths:
+            painter.setBrush(self._brush_polygon)
+            painter.drawPath(polygons)
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawPath(lines)
+            painter.setBrush(self._brush_point)
+            painter.drawPath(points)
+
+    def showEvent(self, a0: QShowEvent) -> None:
+        self.view_changed()
+        return super().showEvent(a0)
+
+    def resizeEvent(self, a0: QResizeEvent) -> None:
+        if self._extent and a0.oldSize().width() <= 0:
+            self.zoom_to_full_extent()
+        else:
+            self.view_changed()
+        return super().resizeEvent(a0)
+
+    def wheelEvent(self, a0: QWheelEvent) -> None:
+        if not self._path:
+            return
+
+        position = a0.position()
+        offset_x = position.x() - self.width() / 2
+        offset_y = position.y() - self.height() / 2
+        before = QPointF(self._center.x() + offset_x * self._scale,
+                         self._center.y() - offset_y * self._scale)
+
+        if a0.angleDelta().y() > 0:
+            self._scale /= self.zoom_step
+        else:
+            self._scale *= self.zoom_step
+
+        self._center = QPointF(before.x() - offset_x * self._scale,
+                               before.y() + offset_y * self._scale)
+        self.view_changed()
+
+    def mousePressEvent(self, a0: QMouseEvent) -> None:
+        if a0.button() == Qt.MouseButton.LeftButton:
+            self._drag_start = a0.pos()
+
+    def mouseMoveEvent(self, a0: QMouseEvent) -> None:
+        if self._drag_start is not None:
+            delta = a0.pos() - self._drag_start
+            self._drag_start = a0.pos()
+            self._center += QPointF(-delta.x() * self._scale, delta.y() * self._scale)
+            self.view_changed()
+
+    def mouseReleaseEvent(self, a0: QMouseEvent) -> None:
+        self._drag_start = None
+
+    def mouseDoubleClickEvent(self, a0: QMouseEvent) -> None:
+        self.zoom_to_full_extent()
@@ -0,0 +1,138 @@
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from osgeo import gdal, ogr
+
+BoundingBox = Tuple[float, float, float, float]
+
+FID_COLUMN = "fid"
+GEOMETRY_COLUMN = "geometry"
+
+_field_dtypes = {
+    ogr.OFTInteger: np.int32,
+    ogr.OFTInteger64: np.int64,
+    ogr.OFTReal: np.float64,
+}
+
+
+def read_columns(layer: ogr.Layer,
+                 columns: List[str] = None,
+                 attribute_filter: str = None,
+                 spatial_filter: Union[BoundingBox, ogr.Geometry] = None,
+                 geometry: bool = True,
+                 batch_size: int = 65536) -> Dict[str, np.ndarray]:
+
+    layerDef: ogr.FeatureDefn = layer.GetLayerDefn()
+    fields = [layerDef.GetFieldDefn(i).GetName() for i in range(layerDef.GetFieldCount())]
+
+    if columns is None:
+        columns = fields
+
+    unknown = [column for column in columns if column not in fields]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}.")
+
+    ignored = [field for field in fields if field not in columns] + ["OGR_STYLE"]
+    if not geometry:
+        ignored.append("OGR_GEOMETRY")
+
+    if layer.SetAttributeFilter(attribute_filter) != ogr.OGRERR_NONE:
+        message = gdal.GetLastErrorMsg()
+        layer.SetAttributeFilter(None)
+        raise ValueError(message)
+
+    layer.SetIgnoredFields(ignored)
+
+    if isinstance(spatial_filter, ogr.Geometry):
+        layer.SetSpatialFilter(spatial_filter)
+    elif spatial_filter is not None:
+        min_x, min_y, max_x, max_y = spatial_filter
+        layer.SetSpatialFilterRect(min_x, min_y, max_x, max_y)
+
+    layer.ResetReading()
+
+    try:
+        if hasattr(layer, "GetArrowStreamAsNumPy"):
+            return _read_arrow_stream(layer, columns, geometry, batch_size)
+        return _read_features(layer, columns, geometry)
+    finally:
+        layer.SetIgnoredFields([])
+        layer.SetAttributeFilter(None)
+        layer.SetSpatialFilter(None)
+        layer.ResetReading()
+
+
+def _read_arrow_stream(layer: ogr.Layer, columns: List[str], geometry: bool,
+                       batch_size: int) -> Dict[str, np.ndarray]:
+
+    fid_column = layer.GetFIDColumn() or "OGC_FID"
+    geometry_column = layer.GetGeometryColumn() or "wkb_geometry"
+
+    names = {fid_column: FID_COLUMN}
+    if geometry:
+        names[geometry_column] = GEOMETRY_COLUMN
+    for column in columns:
+        names[column] = column
+
+    batches: Dict[str, List[np.ndarray]] = {name: [] for name in names.values()}
+
+    stream = layer.GetArrowStreamAsNumPy(
+        options=["INCLUDE_FID=YES", f"MAX_FEATURES_IN_BATCH={batch_size}"])
+
+    for batch in stream:
+        for key, values in batch.items():
+            if key in names:
+                batches[names[key]].append(values)
+
+    return {name: _concatenate(values) for name, values in batches.items()}
+
+
+def _concatenate(values: List[np.ndarray]) -> np.ndarray:
+    if not values:
+        return np.array([], dtype=object)
+    if any(isinstance(value, np.ma.MaskedArray) for value in values):
+        return np.ma.concatenate(values)
+    return np.concatenate(values)
+
+
+def _read_features(layer: ogr.Layer, columns: List[str],
+                   geometry: bool) -> Dict[str, np.ndarray]:
+
+    layerDef: ogr.FeatureDefn = layer.GetLayerDefn()
+    indexes = [layerDef.GetFieldIndex(column) for column in columns]
+
+    fids = []
+    geometries = []
+    values: List[list] = [[] for _ in columns]
+    masks: List[list] = [[] for _ in columns]
+
+    feature: ogr.Feature = layer.GetNextFeature()
+    while feature is not None:
+        fids.append(feature.GetFID())
+
+        if geometry:
+            geom: ogr.Geometry = feature.GetGeometryRef()
+            geometries.append(geom.ExportToIsoWkb() if geom else None)
+
+        for i, index in enumerate(indexes):
+            is_null = not feature.IsFieldSetAndNotNull(index)
+            masks[i].append(is_null)
+            values[i].append(None if is_null else feature.GetField(index))
+
+        feature = layer.GetNextFeature()
+
+    result = {FID_COLUMN: np.array(fids, dtype=np.int64)}
+
+    if geometry:
+        result[GEOMETRY_COLUMN] = np.array(geometries, dtype=object)
+
+    for i, (column, index) in enumerate(zip(columns, indexes)):
+        dtype = _field_dtypes.get(layerDef.GetFieldDefn(index).GetType(), object)
+        if dtype is object:
+            result[column] = np.array(values[i], dtype=object)
+        else:
+            filled = [0 if value is None else value for value in values[i]]
+            result[column] = np.ma.masked_array(np.array(filled, dtype=dtype), mask=masks[i])
+
+    return result
@@ -1,34 +1,136 @@
-from typing import Union, List
+from typing import Union, List, Set, Tuple, Dict
 from pathlib import Path
+import re
+from functools import partial
 
 from PyQt5.QtCore import QObject, pyqtSignal
 
+import numpy as np
+
 from osgeo import gdal, ogr, osr
 
-from .enums import DataType
+from .columnar import BoundingBox, read_columns
+from .enums import DataType, Priority
+from .handlepool import handle_pool
+from .layerinfo import LayerInfo
+from .processjobs import validate_geometries
+from .processpool import ProcessPoolWorker
+from .rasterstats import (BandPlan, BandStatistics, RasterStatisticsPlanWorker,
+                          RasterStatisticsWorker)
+from .scheduler import JobFuture, JobScheduler, job_error, writer_category
+from .spatialindex import STRTree, SpatialIndexWorker
+from .workers import (OpenDatasetWorker, FeatureCountWorker, SqlPreviewWorker,
+                      ExportLayerWorker, MaterializeSqlWorker, ExtractFeaturesWorker, open_dataset,
+                      layer_capabilities, read_layers_names, export_translate_options)
 from ..settings.appsettings import ApplicationSettings
+from ..settings.metadatacache import DatasetMetadata, MetadataCache, dataset_signature
+
+
+INVALID_FILE_NAME_CHARACTERS = re.compile(r'[\x00-\x1f\\/:*?"<>|]')
+
+
+def unique_file_stem(name: str, used_names: Set[str]) -> str:
+    stem = INVALID_FILE_NAME_CHARACTERS.sub("_", name).strip(" .") or "layer"
+
+    candidate = stem
+    suffix = 1
+    while candidate.lower() in used_names:
+        candidate = f"{stem}_{suffix}"
+        suffix += 1
+
+    used_names.add(candidate.lower())
+    return candidate
 
 
 class SpatialData(QObject):
 
+    batch_export_category = "batch_export"
+    raster_statistics_category = "raster_statistics"
+    process_pool_category = "process_pool"
+
     dataChanged = pyqtSignal()
     layersChanged = pyqtSignal()
+    dataLoadingStarted = pyqtSignal()
+    dataLoadingProgress = pyqtSignal(float)
+    dataLoadingCanceled = pyqtSignal()
+    dataLoadingFinished = pyqtSignal()
+    featureCountChanged = pyqtSignal(str, int)
+    sqlPreviewFinished = pyqtSignal(int, bool, str)
+    exportProgress = pyqtSignal(str, float)
+    exportFinished = pyqtSignal(str, bool)
+    batchExportProgress = pyqtSignal(int, int, float)
+    batchExportFinished = pyqtSignal(int, int)
+    rasterStatisticsUpdated = pyqtSignal(int, object)
+    rasterStatisticsProgress = pyqtSignal(float)
+    rasterStatisticsFinished = pyqtSignal()
+    geometryValidationProgress = pyqtSignal(str, float)
+    geometryValidationFinished = pyqtSignal(str, object)
+    spatialIndexReady = pyqtSignal(str)
+    materializationProgress = pyqtSignal(str, float)
+    materializationThroughput = pyqtSignal(str, int, float)
+    materializationFinished = pyqtSignal(str, int, str)
+    extractionProgress = pyqtSignal(str, float)
+    extractionFinished = pyqtSignal(str, int, str)
 
     def __init__(self, filename: Union[Path, str] = None) -> None:
         super().__init__()
 
+        self._path_data: Path = None
+
         if filename:
             self._path_data = Path(filename)
 
         self.data_type = DataType.NONE
 
-        self.vector_ds: ogr.DataSource = None
+        self.vector_ds: gdal.Dataset = None
         self.raster_ds: gdal.Dataset = None
         self.driver: gdal.Driver = None
         self._sql_layer: ogr.Layer = None
+        self._sql_query: Tuple[str, str] = None
+        self._pooled_path: str = None
+        self._update_mode = False
+        self._layer_capabilities: Tuple[bool, bool] = (False, False)
 
         self._last_sql_error: str = None
 
+        self._scheduler = JobScheduler(parent=self)
+        self._scheduler.set_category_limit(self.process_pool_category, 1)
+        self._open_worker: OpenDatasetWorker = None
+        self._sql_preview_worker: SqlPreviewWorker = None
+        self._export_workers: Dict[str, ExportLayerWorker] = {}
+
+        self._batch_export_workers: Dict[str, ExportLayerWorker] = {}
+        self._batch_export_progress: Dict[str, float] = {}
+        self._batch_export_results: Dict[str, bool] = {}
+
+        self._raster_statistics_plan_worker: RasterStatisticsPlanWorker = None
+        self._raster_statistics_workers: List[RasterStatisticsWorker] = []
+        self._raster_statistics_workers_count = 1
+        self._raster_statistics: Dict[int, BandStatistics] = {}
+        self._raster_statistics_windows = 0
+        self._raster_statistics_windows_read = 0
+
+        self._geometry_validation_worker: ProcessPoolWorker = None
+        self._materialize_worker: MaterializeSqlWorker = None
+        self._extract_worker: ExtractFeaturesWorker = None
+
+        self._metadata_cache = MetadataCache(parent=self)
+        self._metadata: DatasetMetadata = None
+
+        self._layers_info: Dict[str, LayerInfo] = {}
+        self._count_workers: Dict[str, FeatureCountWorker] = {}
+        self._spatial_indexes: Dict[str, STRTree] = {}
+        self._spatial_index_workers: Dict[str, SpatialIndexWorker] = {}
+
+        self._layers_names: List[str] = []
+        self._layers_index: Dict[str, int] = {}
+
+        self.layersChanged.connect(self._clear_layers_info)
+
+    @property
+    def scheduler(self) -> JobScheduler:
+        return self._scheduler
+
     @property
     def is_vector(self) -> bool:
         return self.data_type == DataType.VECTOR
@@ -37,39 +139,204 @@ class SpatialData(QObject):
     def path_data(self) -> str:
         return self._path_data.absolute().as_posix()
 
-    def read_data(self, filename: Union[Path, str]) -> None:
+    @property
+    def is_loading(self) -> bool:
+        return self._open_worker is not None
+
+    def _set_path_data(self, filename: Union[Path, str]) -> None:
         if filename:
             self._path_data = Path(filename)
             app = ApplicationSettings()
             app.setValue(app.data_folder_key, self._path_data.parent.as_posix())
 
+    def read_data(self, filename: Union[Path, str]) -> None:
+        self.cancel_read_data()
+        self._set_path_data(filename)
+
         self._identify_driver()
         self._read_data()
 
-    def _read_data(self) -> None:
-        if self.driver:
+    def read_data_async(self, filename: Union[Path, str]) -> None:
+        self.cancel_read_data()
+        self.cancel_sql_preview()
+        self.cancel_raster_statistics()
+        self._set_path_data(filename)
 
-            ds_ogr: ogr.DataSource = ogr.Open(self.path_data, True)
+        if self._path_data is None or not self._path_data.exists():
+            return
 
-            if ds_ogr:
-                self.data_type = DataType.VECTOR
-                self.vector_ds = ds_ogr
-                self.dataChanged.emit()
-                return
+        metadata = self._metadata_cache.get(self.path_data)
+        if metadata:
+            self._apply_metadata(metadata)
 
-            ds_gdal: gdal.Dataset = gdal.OpenEx(self.path_data)
+        worker = OpenDatasetWorker(self.path_data, metadata.driver_name if metadata else None)
+        worker.signal.percentDone.connect(partial(self._data_loading_progress, worker))
+        worker.signal.result.connect(partial(self._data_opened, worker))
 
-            if ds_gdal:
-                self.data_type = DataType.RASTER
-                self.raster_ds = ds_gdal
-                self.dataChanged.emit()
-                return
+        self._open_worker = worker
+        self.dataLoadingStarted.emit()
+        future = self._scheduler.submit(worker, Priority.HIGH)
+        future.add_done_callback(partial(self._data_loading_finished, worker))
+
+    def cancel_read_data(self) -> None:
+        if self._open_worker:
+            self._open_worker.cancel()
+            self._open_worker = None
+            self.dataLoadingCanceled.emit()
+
+    def _data_opened(self, worker: OpenDatasetWorker,
+                     result: Tuple[gdal.Driver, DataType, Union[ogr.DataSource, gdal.Dataset],
+                                   List[str], Tuple[bool, bool]]) -> None:
+        if worker is not self._open_worker:
+            return
+
+        driver, data_type, ds, layers_names, capabilities = result
+
+        if ds is None:
+            return
+
+        self.driver = driver
+        self._layer_capabilities = capabilities
+
+        if self._matches_metadata(data_type, layers_names):
+            self._attach_dataset(data_type, ds)
+        else:
+            self._set_dataset(data_type, ds, layers_names)
+
+    def _data_loading_progress(self, worker: OpenDatasetWorker, percent: float) -> None:
+        if worker is self._open_worker:
+            self.dataLoadingProgress.emit(percent)
+
+    def _data_loading_finished(self, worker: OpenDatasetWorker, future: JobFuture) -> None:
+        if worker is self._open_worker:
+            self._open_worker = None
+            self.dataLoadingFinished.emit()
+
+    def _set_dataset(self, data_type: DataType, ds: Union[ogr.DataSource, gdal.Dataset],
+                     layers_names: List[str]) -> None:
+        if ds is None:
+            return
+
+        self.release_sql_layer()
+        self.cancel_sql_preview()
+        self.cancel_raster_statistics()
+        self._clear_layers_info()
+
+        self.data_type = data_type
+        self._set_layers_names(layers_names)
+        self._attach_dataset(data_type, ds)
+        self._store_metadata()
+
+        self.dataChanged.emit()
+
+    def _attach_dataset(self, data_type: DataType, ds: Union[ogr.DataSource,
+                                                                gdal.Dataset]) -> None:
+        if self._pooled_path:
+            handle_pool().release(self._pooled_path)
+        self._pooled_path = self.path_data
+        self._update_mode = False
+
+        if data_type == DataType.VECTOR:
+            self.vector_ds = ds
+            self.raster_ds = None
+        else:
+            self.raster_ds = ds
+            self.vector_ds = None
+
+    def _upgrade_to_update(self) -> bool:
+        if self.is_materializing or self.is_extracting:
+            return False
+
+        if self._update_mode:
+            return True
+
+        data_type, ds = open_dataset(self.path_data, self.driver, update=True)
+        if data_type != DataType.VECTOR:
+            return False
+
+        self.release_sql_layer()
+
+        self.vector_ds = ds
+        self._update_mode = True
+        handle_pool().adopt_writer(self.path_data, ds)
+
+        return True
+
+    def _apply_metadata(self, metadata: DatasetMetadata) -> None:
+        self.release_sql_layer()
+        self.cancel_sql_preview()
+        self.cancel_raster_statistics()
+        self._clear_layers_info()
+
+        self.driver = gdal.GetDriverByName(metadata.driver_name)
+        self.data_type = DataType[metadata.data_type]
+        self.vector_ds = None
+        self.raster_ds = None
+        self._metadata = metadata
+        self._layer_capabilities = (metadata.allow_create_layer, metadata.allow_delete_layer)
+        self._set_layers_names(metadata.layers_names)
+        self._layers_info = dict(metadata.layers)
+
+        self.dataChanged.emit()
+
+    def _matches_metadata(self, data_type: DataType, layers_names: List[str]) -> bool:
+        return (self._metadata is not None and self.vector_ds is None and
+                self.raster_ds is None and self._metadata.path == self.path_data and
+                self._metadata.data_type == data_type.name and
+                self._metadata.layers_names == layers_names)
+
+    def _dataset_files(self) -> List[str]:
+        ds = self.vector_ds or self.raster_ds
+        files = ds.GetFileList() if ds else None
+        return files or [self.path_data]
+
+    def _store_metadata(self) -> None:
+        files = self._dataset_files()
+        signature = dataset_signature(files)
+
+        if signature is None or self.driver is None:
+            return
+
+        self._metadata = DatasetMetadata(path=self.path_data,
+                                         files=files,
+                                         signature=signature,
+                                         driver_name=self.driver.ShortName,
+                                         data_type=self.data_type.name,
+                                         layers_names=list(self._layers_names),
+                                         raster_band_count=self.raster_band_count,
+                                         allow_create_layer=bool(self.ds_allow_create_layer),
+                                         allow_delete_layer=bool(self.ds_allow_delete_layer))
+        self._metadata_cache.put(self._metadata)
+
+    def _remember_layer_info(self, layer_info: LayerInfo) -> None:
+        if self._metadata and self._metadata.path == self.path_data:
+            self._metadata.layers[layer_info.name] = layer_info
+            self._metadata_cache.save_later()
+
+    def _read_data(self) -> None:
+        if self.driver:
+            data_type, ds = open_dataset(self.path_data, self.driver)
+            layers_names = []
+            self._layer_capabilities = (False, False)
+            if data_type == DataType.VECTOR:
+                layers_names = read_layers_names(ds)
+                self._layer_capabilities = layer_capabilities(self.path_data, self.driver)
+            self._set_dataset(data_type, ds, layers_names)
 
     def _identify_driver(self) -> None:
         if self._path_data:
             if self._path_data.exists():
                 self.driver = gdal.IdentifyDriver(self.path_data)
 
+    @property
+    def raster_band_count(self) -> int:
+        if self.data_type == DataType.RASTER:
+            if self.raster_ds:
+                return self.raster_ds.RasterCount
+            if self._metadata:
+                return self._metadata.raster_band_count
+        return 0
+
     @property
     def driver_name(self) -> str:
         if self.driver:
@@ -79,26 +346,44 @@ class SpatialData(QObject):
     @property
     def ds_allow_create_layer(self) -> bool:
         if self.is_vector and self.vector_ds:
-            return self.vector_ds.TestCapability(ogr.ODsCCreateLayer)
+            if self._update_mode:
+                return bool(self.vector_ds.TestCapability(ogr.ODsCCreateLayer))
+            return self._layer_capabilities[0]
         return False
 
     @property
     def ds_allow_delete_layer(self) -> bool:
         if self.is_vector and self.vector_ds:
-            return self.vector_ds.TestCapability(ogr.ODsCDeleteLayer)
+            if self._update_mode:
+                return bool(self.vector_ds.TestCapability(ogr.ODsCDeleteLayer))
+            return self._layer_capabilities[1]
         return False
 
     @property
     def layers_names(self) -> List[str]:
+        if self.is_vector:
+            return list(self._layers_names)
+        return []
 
-        layer_names = []
+    def _set_layers_names(self, layers_names: List[str]) -> None:
+        self._layers_names = list(layers_names)
+        self._layers_index = {name: i for i, name in enumerate(self._layers_names)}
 
-        if self.is_vector and self.vector_ds:
-            for i in range(self.vector_ds.GetLayerCount()):
-                lyr = self.vector_ds.GetLayerByIndex(i)
-                layer_names.append(lyr.GetName())
+    def _remove_layer_name(self, layer_name: str) -> None:
+        index = self._layers_index.pop(layer_name)
+        del self._layers_names[index]
+        for i in range(index, len(self._layers_names)):
+            self._layers_index[self._layers_names[i]] = i
+
+    def _append_layer_name(self, layer_name: str) -> None:
+        self._layers_index[layer_name] = len(self._layers_names)
+        self._layers_names.append(layer_name)
 
-        return layer_names
+    def has_layer(self, layer_name: str) -> bool:
+        return layer_name in self._layers_index
+
+    def layer_index(self, layer_name: str) -> int:
+        return self._layers_index.get(layer_name, -1)
 
     @property
     def sql_error(self) -> str:
@@ -115,85 +400,636 @@ class SpatialData(QObject):
         else:
             return -1
 
-    def read_feature_count(self, layer_name: str) -> int:
-        layer = self.vector_ds.GetLayerByName(layer_name)
-        return layer.GetFeatureCount()
+    def _clear_layers_info(self) -> None:
+        self._layers_info.clear()
+        for worker in self._count_workers.values():
+            worker.cancel()
+        self._count_workers.clear()
+        for worker in self._spatial_index_workers.values():
+            worker.cancel()
+        self._spatial_index_workers.clear()
+        self._spatial_indexes.clear()
+
+    def layer_info(self, layer_name: str) -> LayerInfo:
+        if layer_name not in self._layers_info:
+            if self.vector_ds:
+                layer_info = self._read_layer_info(self.vector_ds, layer_name)
+            else:
+                with handle_pool().reader(self.path_data) as ds:
+                    layer_info = self._read_layer_info(ds, layer_name)
+            if layer_info is None:
+                return None
+            self._layers_info[layer_name] = layer_info
+            self._remember_layer_info(layer_info)
+        return self._layers_info[layer_name]
+
+    @staticmethod
+    def _read_layer_info(ds: Union[ogr.DataSource, gdal.Dataset], layer_name: str) -> LayerInfo:
+        layer = ds.GetLayerByName(layer_name) if ds else None
+        if layer is None:
+            return None
+        return LayerInfo.from_layer(layer)
+
+    def read_feature_count(self, layer_name: str, exact: bool = False) -> int:
+        layer_info = self.layer_info(layer_name)
+        if exact and not layer_info.feature_count_exact:
+            with handle_pool().reader(self.path_data) as ds:
+                layer = ds.GetLayerByName(layer_name)
+                self._set_exact_feature_count(layer_name, layer.GetFeatureCount())
+        return layer_info.feature_count
+
+    def is_feature_count_exact(self, layer_name: str) -> bool:
+        return self.layer_info(layer_name).feature_count_exact
+
+    def count_features_async(self, layer_name: str) -> None:
+        layer_info = self.layer_info(layer_name)
+
+        if layer_info is None or layer_info.feature_count_exact:
+            return
+
+        if layer_name in self._count_workers:
+            return
+
+        worker = FeatureCountWorker(self.path_data, layer_name)
+        worker.signal.result.connect(partial(self._feature_count_done, worker))
+        self._count_workers[layer_name] = worker
+        future = self._scheduler.submit(worker, Priority.NORMAL)
+        future.add_done_callback(partial(self._feature_count_finished, worker))
+
+    def _feature_count_done(self, worker: FeatureCountWorker, count: int) -> None:
+        if self._count_workers.get(worker.layer_name) is not worker:
+            return
+
+        del self._count_workers[worker.layer_name]
+        self._set_exact_feature_count(worker.layer_name, count)
+
+    def _feature_count_finished(self, worker: FeatureCountWorker, future: JobFuture) -> None:
+        if self._count_workers.get(worker.layer_name) is worker:
+            self._feature_count_done(worker, -1)
+
+    def _set_exact_feature_count(self, layer_name: str, count: int) -> None:
+        layer_info = self._layers_info.get(layer_name)
+        if count < 0:
+            self.featureCountChanged.emit(layer_name, count)
+        elif layer_info:
+            layer_info.feature_count = count
+            layer_info.feature_count_exact = True
+            if self._metadata:
+                self._metadata_cache.save_later()
+            self.featureCountChanged.emit(layer_name, count)
 
     def read_fid_field(self, layer_name: str) -> List[str]:
-        fields = []
-        layer = self.vector_ds.GetLayerByName(layer_name)
-        fields.append(f"{layer.GetFIDColumn()} (FID column)")
-        return fields
+        return [f"{self.layer_info(layer_name).fid_column} (FID column)"]
 
     def read_geometry_fields(self, layer_name: str) -> List[str]:
-        fields = []
+        return [
+            f"{name} ({type_name})"
+            for name, type_name in self.layer_info(layer_name).geometry_fields
+        ]
+
+    def read_attribute_fields(self, layer_name: str) -> List[str]:
+        return [
+            f"{name} ({type_name})"
+            for name, type_name in self.layer_info(layer_name).attribute_fields
+        ]
+
+    def crs(self, layer_name: str) -> osr.SpatialReference:
+        with handle_pool().reader(self.path_data) as ds:
+            layer = ds.GetLayerByName(layer_name) if ds else None
 
-        layer = self.vector_ds.GetLayerByName(layer_name)
+            if layer:
+                crs: osr.SpatialReference = layer.GetSpatialRef()
+                if crs:
+                    return crs.Clone()
+                return None
 
-        layerDef: ogr.FeatureDefn = layer.GetLayerDefn()
+    def identify_crs(self, layer_name: str) -> str:
+        layer_info = self.layer_info(layer_name)
+        if layer_info:
+            return layer_info.crs
+        return None
 
-        for i in range(layerDef.GetGeomFieldCount()):
-            fieldDef: ogr.GeomFieldDefn = layerDef.GetGeomFieldDefn(i)
-            fields.append(f"{fieldDef.GetName()} ({ogr.GeometryTypeToName(fieldDef.GetType())})")
+    def read_columns(self,
+                     layer_name: str,
+                     columns: List[str] = None,
+                     attribute_filter: str = None,
+                     spatial_filter: Union[BoundingBox, ogr.Geometry] = None,
+                     geometry: bool = True) -> Dict[str, np.ndarray]:
+        with handle_pool().reader(self.path_data) as ds:
+            layer = ds.GetLayerByName(layer_name) if ds else None
+            if layer is None:
+                return None
+            return read_columns(layer,
+                                columns=columns,
+                                attribute_filter=attribute_filter,
+                                spatial_filter=spatial_filter,
+                                geometry=geometry)
 
-        return fields
+    def spatial_index(self, layer_name: str) -> STRTree:
+        return self._spatial_indexes.get(layer_name)
 
-    def read_attribute_fields(self, layer_name: str) -> List[str]:
-        fields = []
+    def build_spatial_index_async(self, layer_name: str) -> None:
+        if layer_name in self._spatial_indexes or layer_name in self._spatial_index_workers:
+            return
 
-        layer = self.vector_ds.GetLayerByName(layer_name)
+        worker = SpatialIndexWorker(self.path_data, layer_name)
+        worker.signal.result.connect(partial(self._spatial_index_built, worker))
+        self._spatial_index_workers[layer_name] = worker
+        future = self._scheduler.submit(worker, Priority.LOW)
+        future.add_done_callback(partial(self._spatial_index_finished, worker))
 
-        layerDef: ogr.FeatureDefn = layer.GetLayerDefn()
+    def _spatial_index_built(self, worker: SpatialIndexWorker, result: Tuple[str,
+                                                                            STRTree]) -> None:
+        if self._spatial_index_workers.get(worker.layer_name) is not worker:
+            return
 
-        for i in range(layerDef.GetFieldCount()):
-            fieldDef: ogr.FieldDefn = layerDef.GetFieldDefn(i)
-            fields.append(f"{fieldDef.GetName()} ({fieldDef.GetTypeName()})")
+        layer_name, tree = result
+        del self._spatial_index_workers[layer_name]
+        self._spatial_indexes[layer_name] = tree
+        self.spatialIndexReady.emit(layer_name)
 
-        return fields
+    def _spatial_index_finished(self, worker: SpatialIndexWorker, future: JobFuture) -> None:
+        if self._spatial_index_workers.get(worker.layer_name) is worker:
+            del self._spatial_index_workers[worker.layer_name]
 
-    def crs(self, layer_name: str) -> osr.SpatialReference:
-        layer = self.vector_ds.GetLayerByName(layer_name)
+    def query_features(self, layer_name: str, bbox: BoundingBox) -> np.ndarray:
+        tree = self.spatial_index(layer_name)
+        if tree is None:
+            return None
+        return tree.query(bbox)
 
-        if layer:
-            crs: osr.SpatialReference = layer.GetSpatialRef()
-            if crs:
-                return crs
+    def nearest_features(self, layer_name: str, x: float, y: float, k: int = 1) -> np.ndarray:
+        tree = self.spatial_index(layer_name)
+        if tree is None:
             return None
+        return tree.nearest(x, y, k)
 
-    def identify_crs(self, layer_name: str) -> str:
+    @property
+    def is_extracting(self) -> bool:
+        return self._extract_worker is not None
 
-        crs: osr.SpatialReference = self.crs(layer_name)
+    def extract_features_async(self, layer_name: str, fids: np.ndarray, extent: BoundingBox,
+                               new_layer_name: str) -> bool:
+        if (self.is_extracting or not self.has_layer(layer_name) or
+                new_layer_name == layer_name):
+            return False
 
-        if crs:
-            authority = crs.GetAuthorityName(None)
-            code = crs.GetAuthorityCode(None)
+        self.release_sql_layer()
 
-            if authority and code:
-                return f"{authority}:{code}"
-            else:
-                return f"{crs.ExportToWkt()}"
+        worker = ExtractFeaturesWorker(self.path_data, layer_name, np.sort(fids).tolist(), extent,
+                                       new_layer_name,
+                                       self.driver.ShortName if self.driver else None)
+        worker.signal.percentDone.connect(
+            partial(self._extraction_progress, worker, new_layer_name))
+        worker.signal.result.connect(partial(self._extraction_done, worker))
 
-        return None
+        self._extract_worker = worker
+        future = self._scheduler.submit(worker, Priority.NORMAL, writer_category(self.path_data))
+        future.add_done_callback(partial(self._extraction_finished, worker))
+        return True
+
+    def cancel_extraction(self) -> None:
+        if self._extract_worker:
+            self._extract_worker.cancel()
+
+    def _extraction_progress(self, worker: ExtractFeaturesWorker, layer_name: str,
+                             percent: float) -> None:
+        if worker is self._extract_worker:
+            self.extractionProgress.emit(layer_name, percent)
+
+    def _extraction_done(self, worker: ExtractFeaturesWorker, result: Tuple[str, int,
+                                                                          str]) -> None:
+        if worker is not self._extract_worker:
+            return
+
+        self._extract_worker = None
+        layer_name, written, error = result
+
+        self._reload_layers()
+
+        if not worker.is_canceled:
+            self.extractionFinished.emit(layer_name, written, error or "")
+
+    def _extraction_finished(self, worker: ExtractFeaturesWorker, future: JobFuture) -> None:
+        if worker is self._extract_worker:
+            self._extraction_done(worker, (worker.new_layer_name, 0, job_error(future)))
 
     def delete_layer(self, layer_name: str) -> None:
-        if layer_name in self.layers_names:
-            self.vector_ds.DeleteLayer(layer_name)
-            self.layersChanged.emit()
+        self.delete_layers([layer_name])
+
+    def delete_layers(self, layers_names: List[str]) -> None:
+        indexes = sorted({self.layer_index(name) for name in layers_names if self.has_layer(name)},
+                         reverse=True)
+
+        if not indexes or not self._upgrade_to_update():
+            return
+
+        self.release_sql_layer()
+
+        with handle_pool().writer(self.path_data):
+            self._delete_layers(indexes)
+
+        self._store_metadata()
+        self.layersChanged.emit()
+
+    def _delete_layers(self, indexes: List[int]) -> None:
+        use_transaction = self.vector_ds.TestCapability(ogr.ODsCTransactions)
+
+        if use_transaction and self.vector_ds.StartTransaction() != ogr.OGRERR_NONE:
+            return
+
+        failed = False
+        for index in indexes:
+            if self.vector_ds.DeleteLayer(index) != ogr.OGRERR_NONE:
+                failed = True
+                break
+
+        if failed:
+            if use_transaction:
+                self.vector_ds.RollbackTransaction()
+            self._set_layers_names(read_layers_names(self.vector_ds))
+        elif use_transaction and self.vector_ds.CommitTransaction() != ogr.OGRERR_NONE:
+            self._set_layers_names(read_layers_names(self.vector_ds))
+        else:
+            deleted = set(indexes)
+            self._set_layers_names(
+                [name for i, name in enumerate(self._layers_names) if i not in deleted])
+
+    def release_sql_layer(self) -> None:
+        if self._sql_layer:
+            self.vector_ds.ReleaseResultSet(self._sql_layer)
+            self._sql_layer = None
 
     def execute_sql(self, sql: str, sql_flavor: str) -> None:
+        self.release_sql_layer()
+        self._sql_query = (sql, sql_flavor)
         self._sql_layer = self.vector_ds.ExecuteSQL(sql, dialect=sql_flavor)
         if self._sql_layer is None:
             self._last_sql_error = gdal.GetLastErrorMsg()
         else:
             self._last_sql_error = None
 
+    def preview_sql(self, sql: str, sql_flavor: str) -> None:
+        self.cancel_sql_preview()
+
+        worker = SqlPreviewWorker(self.path_data, sql, sql_flavor)
+        worker.signal.result.connect(partial(self._sql_preview_done, worker))
+        self._sql_preview_worker = worker
+        future = self._scheduler.submit(worker, Priority.HIGH)
+        future.add_done_callback(partial(self._sql_preview_finished, worker))
+
+    def cancel_sql_preview(self) -> None:
+        if self._sql_preview_worker:
+            self._sql_preview_worker.cancel()
+            self._sql_preview_worker = None
+
+    def _sql_preview_done(self, worker: SqlPreviewWorker, result: Tuple[int, bool,
+                                                                         str]) -> None:
+        if worker is not self._sql_preview_worker:
+            return
+
+        self._sql_preview_worker = None
+        count, has_features, error = result
+        self.sqlPreviewFinished.emit(count, has_features, error or "")
+
+    def _sql_preview_finished(self, worker: SqlPreviewWorker, future: JobFuture) -> None:
+        if worker is self._sql_preview_worker:
+            self._sql_preview_done(worker, (0, False, job_error(future)))
+
     def sql_layer_to_layer(self, new_layer_name: str) -> None:
-        if self._sql_layer:
-            self.vector_ds.CopyLayer(self._sql_layer, new_layer_name, options=["OVERWRITE=YES"])
-            self.layersChanged.emit()
-
-    def export_layer(self, layer_name: str, file_name: str) -> None:
-        gdal.VectorTranslate(file_name,
-                             self.vector_ds.GetDescription(),
-                             layers=[layer_name],
-                             layerName=layer_name)
+        if not self._sql_layer or not self._upgrade_to_update():
+            return
+
+        if self._sql_layer is None:
+            self.execute_sql(*self._sql_query)
+            if self._sql_layer is None:
+                return
+
+        with handle_pool().writer(self.path_data):
+            new_layer = self.vector_ds.CopyLayer(self._sql_layer,
+                                                 new_layer_name,
+                                                 options=["OVERWRITE=YES"])
+        self.release_sql_layer()
+        if new_layer:
+            layer_name = new_layer.GetName()
+            if self.has_layer(layer_name):
+                self._remove_layer_name(layer_name)
+            self._append_layer_name(layer_name)
+        self._store_metadata()
+        self.layersChanged.emit()
+
+    @property
+    def is_materializing(self) -> bool:
+        return self._materialize_worker is not None
+
+    def materialize_sql_async(self,
+                              sql: str,
+                              sql_flavor: str,
+                              new_layer_name: str,
+                              chunk_size: int = 10000) -> bool:
+        if self.is_materializing or not self.is_vector:
+            return False
+
+        self.release_sql_layer()
+
+        worker = MaterializeSqlWorker(self.path_data, sql, sql_flavor, new_layer_name,
+                                      self.driver.ShortName if self.driver else None,
+                                      chunk_size)
+        worker.signal.percentDone.connect(
+            partial(self._materialization_progress, worker, new_layer_name))
+        worker.signal.chunkCommitted.connect(
+            partial(self._materialization_throughput, worker, new_layer_name))
+        worker.signal.result.connect(partial(self._materialization_done, worker))
+
+        self._materialize_worker = worker
+        future = self._scheduler.submit(worker, Priority.NORMAL, writer_category(self.path_data))
+        future.add_done_callback(partial(self._materialization_finished, worker))
+        return True
+
+    def cancel_materialization(self) -> None:
+        if self._materialize_worker:
+            self._materialize_worker.cancel()
+
+    def _materialization_progress(self, worker: MaterializeSqlWorker, layer_name: str,
+                                  percent: float) -> None:
+        if worker is self._materialize_worker:
+            self.materializationProgress.emit(layer_name, percent)
+
+    def _materialization_throughput(self, worker: MaterializeSqlWorker, layer_name: str,
+                                    written: int, features_per_second: float) -> None:
+        if worker is self._materialize_worker:
+            self.materializationThroughput.emit(layer_name, written, features_per_second)
+
+    def _materialization_done(self, worker: MaterializeSqlWorker, result: Tuple[str, int,
+                                                                              str]) -> None:
+        if worker is not self._materialize_worker:
+            return
+
+        self._materialize_worker = None
+        layer_name, written, error = result
+
+        self._reload_layers()
+
+        if not worker.is_canceled:
+            self.materializationFinished.emit(layer_name, written, error or "")
+
+    def _materialization_finished(self, worker: MaterializeSqlWorker, future: JobFuture) -> None:
+        if worker is self._materialize_worker:
+            self._materialization_done(worker, (worker.layer_name, 0, job_error(future)))
+
+    def _reload_layers(self) -> None:
+        if self.vector_ds and self._pooled_path == self.path_data:
+            _, ds = open_dataset(self.path_data, self.driver)
+            if ds is not None:
+                self.release_sql_layer()
+                self._attach_dataset(DataType.VECTOR, ds)
+                self._set_layers_names(read_layers_names(ds))
+                self._store_metadata()
+                self.layersChanged.emit()
+
+    def export_layer(self,
+                     layer_name: str,
+                     file_name: str,
+                     driver_name: str = None,
+                     group_transactions: int = None,
+                     layer_creation_options: List[str] = None) -> None:
+        options = export_translate_options(layer_name, driver_name, group_transactions,
+                                           layer_creation_options)
+        gdal.VectorTranslate(file_name, self.path_data, options=options)
+
+    def export_layer_async(self,
+                           layer_name: str,
+                           file_name: str,
+                           driver_name: str = None,
+                           group_transactions: int = None,
+                           layer_creation_options: List[str] = None) -> None:
+        self.cancel_export(file_name)
+
+        worker = ExportLayerWorker(self.path_data, layer_name, file_name, driver_name,
+                                   group_transactions, layer_creation_options)
+        worker.signal.percentDone.connect(partial(self.exportProgress.emit, file_name))
+        worker.signal.result.connect(partial(self._export_done, worker))
+
+        self._export_workers[file_name] = worker
+        future = self._scheduler.submit(worker, Priority.LOW, writer_category(file_name))
+        future.add_done_callback(partial(self._export_finished, worker))
+
+    def cancel_export(self, file_name: str) -> None:
+        worker = self._export_workers.pop(file_name, None)
+        if worker:
+            worker.cancel()
+
+    def _export_done(self, worker: ExportLayerWorker, result: Tuple[str, bool]) -> None:
+        file_name, success = result
+
+        if self._export_workers.get(file_name) is not worker:
+            return
+
+        del self._export_workers[file_name]
+        self.exportFinished.emit(file_name, success)
+
+    def _export_finished(self, worker: ExportLayerWorker, future: JobFuture) -> None:
+        if self._export_workers.get(worker.file_name) is worker:
+            self._export_done(worker, (worker.file_name, False))
+
+    @property
+    def is_batch_exporting(self) -> bool:
+        return len(self._batch_export_workers) > 0
+
+    def export_layers(self,
+                      layers_names: List[str],
+                      folder: Union[Path, str],
+                      driver_name: str,
+                      extension: str,
+                      max_workers: int = None,
+                      group_transactions: int = None,
+                      layer_creation_options: List[str] = None) -> None:
+        self.cancel_batch_export()
+
+        self._scheduler.set_category_limit(
+            self.batch_export_category,
+            min(max_workers or self._scheduler.background_thread_count,
+                self._scheduler.background_thread_count))
+
+        workers = []
+        used_names = set()
+        for layer_name in layers_names:
+            file_name = (Path(folder) /
+                         f"{unique_file_stem(layer_name, used_names)}.{extension}").as_posix()
+            worker = ExportLayerWorker(self.path_data, layer_name, file_name, driver_name,
+                                       group_transactions, layer_creation_options)
+            worker.signal.percentDone.connect(partial(self._batch_export_progress_changed, worker))
+            worker.signal.result.connect(partial(self._batch_export_done, worker))
+            self._batch_export_workers[file_name] = worker
+            self._batch_export_progress[file_name] = 0
+            workers.append(worker)
+
+        for worker in workers:
+            future = self._scheduler.submit(worker, Priority.LOW, self.batch_export_category)
+            future.add_done_callback(partial(self._batch_export_finished, worker))
+
+    def cancel_batch_export(self) -> None:
+        for worker in self._batch_export_workers.values():
+            worker.cancel()
+        self._batch_export_workers.clear()
+        self._batch_export_progress.clear()
+        self._batch_export_results.clear()
+
+    def _batch_export_progress_changed(self, worker: ExportLayerWorker, percent: float) -> None:
+        if self._batch_export_workers.get(worker.file_name) is not worker:
+            return
+
+        self._batch_export_progress[worker.file_name] = percent
+        self._emit_batch_export_progress()
+
+    def _batch_export_done(self, worker: ExportLayerWorker, result: Tuple[str, bool]) -> None:
+        file_name, success = result
+
+        if self._batch_export_workers.get(file_name) is not worker:
+            return
+
+        self._batch_export_progress[file_name] = 100
+        self._batch_export_results[file_name] = success
+        self._emit_batch_export_progress()
+
+        if len(self._batch_export_results) == len(self._batch_export_workers):
+            succeeded = sum(self._batch_export_results.values())
+            failed = len(self._batch_export_results) - succeeded
+            self._batch_export_workers.clear()
+            self._batch_export_progress.clear()
+            self._batch_export_results.clear()
+            self.batchExportFinished.emit(succeeded, failed)
+
+    def _batch_export_finished(self, worker: ExportLayerWorker, future: JobFuture) -> None:
+        if (self._batch_export_workers.get(worker.file_name) is worker and
+                worker.file_name not in self._batch_export_results):
+            self._batch_export_done(worker, (worker.file_name, False))
+
+    def _emit_batch_export_progress(self) -> None:
+        total = len(self._batch_export_workers)
+        percent = sum(self._batch_export_progress.values()) / total
+        self.batchExportProgress.emit(len(self._batch_export_results), total, percent)
+
+    @property
+    def raster_statistics(self) -> Dict[int, BandStatistics]:
+        return dict(self._raster_statistics)
+
+    def compute_raster_statistics(self, bins: int = 256, max_workers: int = None) -> None:
+        self.cancel_raster_statistics()
+
+        if self.raster_band_count == 0:
+            return
+
+        self._raster_statistics_workers_count = min(
+            max_workers or self._scheduler.background_thread_count,
+            self._scheduler.background_thread_count)
+        self._scheduler.set_category_limit(self.raster_statistics_category,
+                                           self._raster_statistics_workers_count)
+
+        worker = RasterStatisticsPlanWorker(self.path_data,
+                                            list(range(1, self.raster_band_count + 1)))
+        worker.signal.result.connect(partial(self._raster_statistics_planned, worker, bins))
+        self._raster_statistics_plan_worker = worker
+        future = self._scheduler.submit(worker, Priority.NORMAL, self.raster_statistics_category)
+        future.add_done_callback(partial(self._raster_statistics_plan_finished, worker, bins))
+
+    def _raster_statistics_planned(self, worker: RasterStatisticsPlanWorker, bins: int,
+                                   plans: List[BandPlan]) -> None:
+        if worker is not self._raster_statistics_plan_worker:
+            return
+
+        self._raster_statistics_plan_worker = None
+
+        for band_number, band_range, windows in plans:
+            self._raster_statistics[band_number] = BandStatistics.empty(
+                band_number, band_range, bins)
+            self._raster_statistics_windows += len(windows)
+
+            chunk_size = max(1, -(-len(windows) // self._raster_statistics_workers_count))
+            for i in range(0, len(windows), chunk_size):
+                worker = RasterStatisticsWorker(self.path_data, band_number,
+                                                windows[i:i + chunk_size], band_range, bins)
+                worker.signal.result.connect(partial(self._raster_statistics_partial, worker))
+                self._raster_statistics_workers.append(worker)
+
+        if not self._raster_statistics_workers:
+            self.rasterStatisticsFinished.emit()
+            return
+
+        for worker in self._raster_statistics_workers:
+            future = self._scheduler.submit(worker, Priority.NORMAL,
+                                            self.raster_statistics_category)
+            future.add_done_callback(partial(self._raster_statistics_worker_done, worker))
+
+    def _raster_statistics_plan_finished(self, worker: RasterStatisticsPlanWorker, bins: int,
+                                         future: JobFuture) -> None:
+        if worker is self._raster_statistics_plan_worker:
+            self._raster_statistics_planned(worker, bins, [])
+
+    def cancel_raster_statistics(self) -> None:
+        if self._raster_statistics_plan_worker:
+            self._raster_statistics_plan_worker.cancel()
+            self._raster_statistics_plan_worker = None
+        for worker in self._raster_statistics_workers:
+            worker.cancel()
+        self._raster_statistics_workers = []
+        self._raster_statistics = {}
+        self._raster_statistics_windows = 0
+        self._raster_statistics_windows_read = 0
+
+    def _raster_statistics_partial(self, worker: RasterStatisticsWorker,
+                                   result: Tuple[BandStatistics, int]) -> None:
+        if worker not in self._raster_statistics_workers:
+            return
+
+        statistics, windows_read = result
+        band_statistics = self._raster_statistics[statistics.band]
+        band_statistics.merge(statistics)
+
+        self._raster_statistics_windows_read += windows_read
+        self.rasterStatisticsUpdated.emit(statistics.band, band_statistics)
+        self.rasterStatisticsProgress.emit(
+            self._raster_statistics_windows_read / self._raster_statistics_windows * 100)
+
+    def _raster_statistics_worker_done(self, worker: RasterStatisticsWorker,
+                                       future: JobFuture) -> None:
+        if worker not in self._raster_statistics_workers:
+            return
+
+        self._raster_statistics_workers.remove(worker)
+
+        if not self._raster_statistics_workers:
+            self.rasterStatisticsFinished.emit()
+
+    def validate_geometries_async(self, layer_name: str, max_workers: int = None) -> None:
+        self.cancel_geometry_validation()
+
+        worker = ProcessPoolWorker(self.path_data, layer_name, validate_geometries, max_workers)
+        worker.signal.percentDone.connect(partial(self._geometry_validation_progress, worker))
+        worker.signal.result.connect(partial(self._geometry_validation_done, worker))
+
+        self._geometry_validation_worker = worker
+        future = self._scheduler.submit(worker, Priority.LOW, self.process_pool_category)
+        future.add_done_callback(partial(self._geometry_validation_finished, worker))
+
+    def cancel_geometry_validation(self) -> None:
+        if self._geometry_validation_worker:
+            self._geometry_validation_worker.cancel()
+            self._geometry_validation_worker = None
+
+    def _geometry_validation_progress(self, worker: ProcessPoolWorker, percent: float) -> None:
+        if worker is self._geometry_validation_worker:
+            self.geometryValidationProgress.emit(worker.layer_name, percent)
+
+    def _geometry_validation_done(self, worker: ProcessPoolWorker,
+                                  result: Tuple[str, np.ndarray]) -> None:
+        if worker is not self._geometry_validation_worker:
+            return
+
+        self._geometry_validation_worker = None
+        layer_name, invalid_fids = result
+        self.geometryValidationFinished.emit(layer_name, invalid_fids)
+
+    def _geometry_validation_finished(self, worker: ProcessPoolWorker, future: JobFuture) -> None:
+        if worker is self._geometry_validation_worker:
+            self._geometry_validation_done(worker, (worker.layer_name, None))
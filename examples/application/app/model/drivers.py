@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple
+import xml.etree.ElementTree as ET
+
+from osgeo import gdal, ogr
+
+DCAP_CREATE_LAYER = getattr(gdal, "DCAP_CREATE_LAYER", None)
+DCAP_DELETE_LAYER = getattr(gdal, "DCAP_DELETE_LAYER", None)
+
+
+def _creation_options_names(xml: str) -> FrozenSet[str]:
+    if not xml:
+        return frozenset()
+    try:
+        root = ET.fromstring(xml)
+    except ET.ParseError:
+        return frozenset()
+    return frozenset(option.get("name") for option in root.iter("Option") if option.get("name"))
+
+
+@dataclass(frozen=True)
+class DriverInfo:
+    name: str
+    long_name: str
+    extensions: Tuple[str, ...]
+    dataset_creation_options: FrozenSet[str]
+    layer_creation_options: FrozenSet[str]
+    capabilities: FrozenSet[str]
+
+    @property
+    def extension(self) -> str:
+        return self.extensions[0]
+
+    @property
+    def file_filter(self) -> str:
+        patterns = " ".join(f"*.{extension}" for extension in self.extensions)
+        return f"{self.long_name} ({patterns})"
+
+    def has_extension(self, extension: str) -> bool:
+        return extension.lower() in self.extensions
+
+    def has_capability(self, capability: str) -> bool:
+        return capability in self.capabilities
+
+    def supports_layer_creation_option(self, option: str) -> bool:
+        return option in self.layer_creation_options
+
+    @classmethod
+    def from_driver(cls, driver: ogr.Driver) -> 'DriverInfo':
+        metadata: Dict[str, str] = driver.GetMetadata()
+
+        extensions = metadata.get(gdal.DMD_EXTENSIONS, "")
+        extensions = tuple(extension.lower() for extension in extensions.split(" ") if extension)
+
+        capabilities = {key for key, value in metadata.items() if key.startswith("DCAP_") and
+                        value == "YES"}
+        if driver.TestCapability(ogr.ODrCCreateDataSource):
+            capabilities.add(ogr.ODrCCreateDataSource)
+
+        return cls(name=driver.GetName(),
+                   long_name=metadata.get(gdal.DMD_LONGNAME, driver.GetName()),
+                   extensions=extensions,
+                   dataset_creation_options=_creation_options_names(
+                       metadata.get(gdal.DMD_CREATIONOPTIONLIST)),
+                   layer_creation_options=_creation_options_names(
+                       metadata.get(gdal.DS_LAYER_CREATIONOPTIONLIST)),
+                   capabilities=frozenset(capabilities))
+
+
+class DriverCatalogue:
+
+    def __init__(self) -> None:
+        self._drivers: Dict[str, DriverInfo] = {}
+        self._by_extension: Dict[str, DriverInfo] = {}
+
+        for i in range(ogr.GetDriverCount()):
+            driver_info = DriverInfo.from_driver(ogr.GetDriver(i))
+            self._drivers[driver_info.name] = driver_info
+
+        self._writable_vector_drivers = [
+            driver_info for driver_info in self._drivers.values()
+            if driver_info.has_capability(ogr.ODrCCreateDataSource) and driver_info.extensions
+        ]
+
+        for driver_info in self._writable_vector_drivers:
+            for extension in driver_info.extensions:
+                self._by_extension.setdefault(extension, driver_info)
+
+    @property
+    def drivers(self) -> List[DriverInfo]:
+        return list(self._drivers.values())
+
+    @property
+    def writable_vector_drivers(self) -> List[DriverInfo]:
+        return list(self._writable_vector_drivers)
+
+    def driver(self, name: str) -> DriverInfo:
+        return self._drivers.get(name)
+
+    def driver_for_extension(self, extension: str) -> DriverInfo:
+        return self._by_extension.get(extension.lower().lstrip("."))
+
+
+@lru_cache(maxsize=None)
+def driver_catalogue() -> DriverCatalogue:
+    return DriverCatalogue()
+
+
+def driver_has_capability(driver: gdal.Driver, capability: str) -> bool:
+    return driver is not None and driver.GetMetadataItem(capability) == "YES"
+
+
+def driver_has_layer_capability(driver: gdal.Driver, capability: str) -> bool:
+    if capability is None:
+        return driver_has_capability(driver, gdal.DCAP_VECTOR) and driver_has_capability(
+            driver, gdal.DCAP_CREATE)
+    return driver_has_capability(driver, capability)
+
+
+def open_flags(driver: gdal.Driver = None, update: bool = False) -> int:
+    flags = gdal.OF_UPDATE if update else gdal.OF_READONLY
+
+    if driver is None:
+        return flags | gdal.OF_VECTOR | gdal.OF_RASTER
+
+    if driver_has_capability(driver, gdal.DCAP_VECTOR):
+        flags |= gdal.OF_VECTOR
+    if driver_has_capability(driver, gdal.DCAP_RASTER):
+        flags |= gdal.OF_RASTER
+
+    return flags
@@ -1,7 +1,13 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 class DataType(Enum):
     NONE = 0
     VECTOR = 1
     RASTER = 2
+
+
+class Priority(IntEnum):
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
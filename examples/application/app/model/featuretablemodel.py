@@ -0,0 +1,165 @@
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+from PyQt5.QtCore import QAbstractTableModel, QObject, QModelIndex, Qt
+
+from osgeo import ogr
+
+from .handlepool import handle_pool
+
+Page = List[List[Any]]
+
+
+class FeatureTableModel(QAbstractTableModel):
+
+    page_size = 1000
+    cache_pages = 5
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+
+        self._path: str = None
+        self._layer_name: str = None
+
+        self._fields: List[str] = []
+        self._row_count = 0
+        self._all_fetched = True
+        self._pages: 'OrderedDict[int, Page]' = OrderedDict()
+
+    def set_layer(self, path: str, layer_name: str) -> None:
+        self.beginResetModel()
+
+        self._clear()
+
+        if path and layer_name:
+            with handle_pool().reader(path) as ds:
+                layer: ogr.Layer = ds.GetLayerByName(layer_name) if ds else None
+
+                if layer:
+                    layerDef: ogr.FeatureDefn = layer.GetLayerDefn()
+                    self._fields = [
+                        layerDef.GetFieldDefn(i).GetName() for i in range(layerDef.GetFieldCount())
+                    ]
+                    self._path = path
+                    self._layer_name = layer_name
+                    self._all_fetched = False
+
+                    if layer.TestCapability(ogr.OLCFastFeatureCount):
+                        self._row_count = max(0, layer.GetFeatureCount())
+                        self._all_fetched = True
+
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._clear()
+        self.endResetModel()
+
+    def _clear(self) -> None:
+        self._path = None
+        self._layer_name = None
+        self._fields = []
+        self._row_count = 0
+        self._all_fetched = True
+        self._pages.clear()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent == QModelIndex():
+            return self._row_count
+        return 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent == QModelIndex() and self._path:
+            return len(self._fields) + 1
+        return 0
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: Qt.ItemDataRole = None):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            if section == 0:
+                return "FID"
+            return self._fields[section - 1]
+        return super().headerData(section, orientation, role)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        if parent == QModelIndex():
+            return not self._all_fetched
+        return False
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        if parent != QModelIndex() or self._all_fetched:
+            return
+
+        page = self._page(self._row_count // self.page_size)
+        if page is None:
+            self._all_fetched = True
+            return
+
+        rows = len(page) - self._row_count % self.page_size
+        if len(page) < self.page_size:
+            self._all_fetched = True
+
+        if rows > 0:
+            first = self._row_count
+            self.beginInsertRows(QModelIndex(), first, first + rows - 1)
+            self._row_count += rows
+            self.endInsertRows()
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            page = self._page(index.row() // self.page_size)
+            row = index.row() % self.page_size
+            if page and row < len(page):
+                return page[row][index.column()]
+        return None
+
+    def _page(self, number: int) -> Page:
+        if number in self._pages:
+            self._pages.move_to_end(number)
+            return self._pages[number]
+
+        with handle_pool().reader(self._path) as ds:
+            layer: ogr.Layer = ds.GetLayerByName(self._layer_name) if ds else None
+            if layer is None:
+                return None
+            page = self._read_page(layer, number * self.page_size)
+
+        self._pages[number] = page
+        while len(self._pages) > self.cache_pages:
+            self._pages.popitem(last=False)
+
+        return page
+
+    def _read_page(self, layer: ogr.Layer, start: int) -> Page:
+        if start > 0 and not self._seek(layer, start):
+            return []
+
+        layer.SetIgnoredFields(["OGR_GEOMETRY", "OGR_STYLE"])
+
+        page = []
+        while len(page) < self.page_size:
+            feature: ogr.Feature = layer.GetNextFeature()
+            if feature is None:
+                break
+
+            row = [feature.GetFID()]
+            for i in range(len(self._fields)):
+                if feature.IsFieldSetAndNotNull(i):
+                    value = feature.GetField(i)
+                    if not isinstance(value, (int, float, str)):
+                        value = str(value)
+                    row.append(value)
+                else:
+                    row.append(None)
+            page.append(row)
+
+        return page
+
+    def _seek(self, layer: ogr.Layer, start: int) -> bool:
+        if layer.TestCapability(ogr.OLCFastSetNextByIndex):
+            return layer.SetNextByIndex(start) == ogr.OGRERR_NONE
+
+        layer.SetIgnoredFields(self._fields + ["OGR_GEOMETRY", "OGR_STYLE"])
+        for _ in range(start):
+            if layer.GetNextFeature() is None:
+                return False
+        return True
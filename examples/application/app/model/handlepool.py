@@ -0,0 +1,195 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Tuple, Union
+import threading
+import time
+
+from osgeo import gdal, ogr
+
+HandleKey = Tuple[str, bool, int]
+
+
+@dataclass
+class HandlePoolStatistics:
+    opened: int = 0
+    reused: int = 0
+    evicted: int = 0
+    live: int = 0
+
+
+@dataclass
+class _Handle:
+    ds: 'BorrowedDataset'
+    last_used: float
+    in_use: bool = False
+    stale: bool = False
+
+
+class BorrowedDataset:
+
+    def __init__(self, ds: gdal.Dataset) -> None:
+        self._ds = ds
+        self._layers: Dict[str, ogr.Layer] = {}
+        self._reset_all = False
+
+    @property
+    def dataset(self) -> gdal.Dataset:
+        self._reset_all = True
+        return self._ds
+
+    def GetLayer(self, layer: Union[int, str] = 0) -> ogr.Layer:
+        return self._take(self._ds.GetLayer(layer))
+
+    def GetLayerByIndex(self, index: int) -> ogr.Layer:
+        return self._take(self._ds.GetLayerByIndex(index))
+
+    def GetLayerByName(self, name: str) -> ogr.Layer:
+        return self._take(self._ds.GetLayerByName(name))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._ds, name)
+
+    def _take(self, layer: ogr.Layer) -> ogr.Layer:
+        if layer is not None:
+            self._layers[layer.GetName()] = layer
+        return layer
+
+    def reset(self) -> None:
+        if self._reset_all:
+            layers = [self._ds.GetLayer(i) for i in range(self._ds.GetLayerCount())]
+        else:
+            layers = self._layers.values()
+
+        for layer in layers:
+            layer.SetAttributeFilter(None)
+            layer.SetSpatialFilter(None)
+            layer.SetIgnoredFields([])
+            layer.ResetReading()
+
+        self._layers = {}
+        self._reset_all = False
+
+
+class DatasetHandlePool:
+
+    def __init__(self, max_idle_seconds: float = 60) -> None:
+        self._max_idle_seconds = max_idle_seconds
+        self._lock = threading.Lock()
+        self._handles: Dict[HandleKey, _Handle] = {}
+        self._writer_locks: Dict[str, threading.RLock] = {}
+        self._writers: Dict[str, gdal.Dataset] = {}
+        self._drivers: Dict[str, str] = {}
+        self._statistics = HandlePoolStatistics()
+
+    @property
+    def statistics(self) -> HandlePoolStatistics:
+        with self._lock:
+            self._statistics.live = len(self._handles) + len(self._writers)
+            return HandlePoolStatistics(**vars(self._statistics))
+
+    @contextmanager
+    def reader(self, path: str) -> Iterator[BorrowedDataset]:
+        key = (path, False, threading.get_ident())
+
+        with self._lock:
+            self._evict_idle()
+            handle = self._handles.get(key)
+            if handle is not None and not handle.stale:
+                handle.in_use = True
+                self._statistics.reused += 1
+            else:
+                handle = None
+
+        if handle is None:
+            ds = self._open(path, gdal.OF_READONLY)
+            if ds is None:
+                yield None
+                return
+            handle = _Handle(BorrowedDataset(ds), time.monotonic(), in_use=True)
+            with self._lock:
+                self._handles[key] = handle
+                self._statistics.opened += 1
+
+        try:
+            yield handle.ds
+        finally:
+            handle.ds.reset()
+            with self._lock:
+                handle.in_use = False
+                handle.last_used = time.monotonic()
+                if handle.stale and self._handles.get(key) is handle:
+                    del self._handles[key]
+
+    @contextmanager
+    def writer(self, path: str) -> Iterator[gdal.Dataset]:
+        with self.writer_lock(path):
+            ds = self._writers.get(path)
+            if ds is None:
+                ds = self._open(path, gdal.OF_UPDATE)
+                if ds is not None:
+                    with self._lock:
+                        self._writers[path] = ds
+                        self._statistics.opened += 1
+            try:
+                yield ds
+            finally:
+                if ds is not None:
+                    ds.FlushCache()
+
+    @contextmanager
+    def writer_lock(self, path: str) -> Iterator[None]:
+        with self._lock:
+            writer_lock = self._writer_locks.setdefault(path, threading.RLock())
+
+        with writer_lock:
+            try:
+                yield
+            finally:
+                self.invalidate(path)
+
+    def adopt_writer(self, path: str, ds: gdal.Dataset) -> None:
+        with self._lock:
+            self._writers[path] = ds
+
+    def _open(self, path: str, flags: int) -> gdal.Dataset:
+        driver_name = self._drivers.get(path)
+        if driver_name:
+            return gdal.OpenEx(path, flags, allowed_drivers=[driver_name])
+
+        ds = gdal.OpenEx(path, flags)
+        if ds is not None:
+            self._drivers[path] = ds.GetDriver().ShortName
+        return ds
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            for key, handle in list(self._handles.items()):
+                if key[0] != path:
+                    continue
+                if handle.in_use:
+                    handle.stale = True
+                else:
+                    del self._handles[key]
+
+    def release(self, path: str) -> None:
+        self.invalidate(path)
+        with self._lock:
+            self._writers.pop(path, None)
+            self._drivers.pop(path, None)
+
+    def evict_idle(self) -> None:
+        with self._lock:
+            self._evict_idle()
+
+    def _evict_idle(self) -> None:
+        now = time.monotonic()
+        for key, handle in list(self._handles.items()):
+            if not handle.in_use and now - handle.last_used > self._max_idle_seconds:
+                del self._handles[key]
+                self._statistics.evicted += 1
+
+
+@lru_cache(maxsize=None)
+def handle_pool() -> DatasetHandlePool:
+    return DatasetHandlePool()
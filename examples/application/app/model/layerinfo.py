@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from osgeo import ogr, osr
+
+
+def crs_to_string(crs: osr.SpatialReference) -> str:
+
+    if crs:
+        authority = crs.GetAuthorityName(None)
+        code = crs.GetAuthorityCode(None)
+
+        if authority and code:
+            return f"{authority}:{code}"
+        else:
+            return f"{crs.ExportToWkt()}"
+
+    return None
+
+
+@dataclass
+class LayerInfo:
+    name: str
+    fid_column: str
+    geometry_fields: List[Tuple[str, str]]
+    attribute_fields: List[Tuple[str, str]]
+    crs: str
+    feature_count: int
+    feature_count_exact: bool
+
+    @classmethod
+    def from_layer(cls, layer: ogr.Layer) -> 'LayerInfo':
+
+        layerDef: ogr.FeatureDefn = layer.GetLayerDefn()
+
+        geometry_fields = []
+        for i in range(layerDef.GetGeomFieldCount()):
+            fieldDef: ogr.GeomFieldDefn = layerDef.GetGeomFieldDefn(i)
+            geometry_fields.append((fieldDef.GetName(), ogr.GeometryTypeToName(fieldDef.GetType())))
+
+        attribute_fields = []
+        for i in range(layerDef.GetFieldCount()):
+            fieldDef: ogr.FieldDefn = layerDef.GetFieldDefn(i)
+            attribute_fields.append((fieldDef.GetName(), fieldDef.GetTypeName()))
+
+        return cls(name=layer.GetName(),
+                   fid_column=layer.GetFIDColumn(),
+                   geometry_fields=geometry_fields,
+                   attribute_fields=attribute_fields,
+                   crs=crs_to_string(layer.GetSpatialRef()),
+                   feature_count=layer.GetFeatureCount(force=0),
+                   feature_count_exact=bool(layer.TestCapability(ogr.OLCFastFeatureCount)))
@@ -0,0 +1,60 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from osgeo import ogr
+
+FidRange = Tuple[int, int]
+
+
+def fid_ranges(fids: np.ndarray, chunks: int) -> List[FidRange]:
+    if fids.size == 0:
+        return []
+
+    fids = np.sort(fids)
+    return [(int(chunk[0]), int(chunk[-1]))
+            for chunk in np.array_split(fids, min(chunks, fids.size))]
+
+
+def open_fid_range(path: str, layer_name: str, fid_range: FidRange) -> Tuple[ogr.DataSource,
+                                                                                ogr.Layer]:
+    ds: ogr.DataSource = ogr.Open(path)
+    layer: ogr.Layer = ds.GetLayerByName(layer_name) if ds else None
+
+    if layer is None:
+        return ds, None
+
+    fid_column = layer.GetFIDColumn() or "FID"
+    first_fid, last_fid = fid_range
+    layer.SetAttributeFilter(f'"{fid_column}" >= {first_fid} AND "{fid_column}" <= {last_fid}')
+
+    return ds, layer
+
+
+def validate_geometries(path: str, layer_name: str, fid_range: FidRange, output_file: str) -> int:
+    ds, layer = open_fid_range(path, layer_name, fid_range)
+
+    if layer is None:
+        np.save(output_file, np.array([], dtype=np.int64))
+        return 0
+
+    layerDef: ogr.FeatureDefn = layer.GetLayerDefn()
+    layer.SetIgnoredFields(
+        [layerDef.GetFieldDefn(i).GetName() for i in range(layerDef.GetFieldCount())] +
+        ["OGR_STYLE"])
+
+    invalid = []
+    processed = 0
+
+    feature: ogr.Feature = layer.GetNextFeature()
+    while feature is not None:
+        geometry: ogr.Geometry = feature.GetGeometryRef()
+        if geometry is not None and not geometry.IsValid():
+            invalid.append(feature.GetFID())
+        processed += 1
+        feature = layer.GetNextFeature()
+
+    ds = None
+
+    np.save(output_file, np.array(invalid, dtype=np.int64))
+    return processed
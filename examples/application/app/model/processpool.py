@@ -0,0 +1,92 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Dict
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from osgeo import ogr
+
+from .columnar import FID_COLUMN, read_columns
+from .handlepool import handle_pool
+from .processjobs import FidRange, fid_ranges
+from .workers import Worker
+
+ProcessJob = Callable[[str, str, FidRange, str], int]
+
+
+class ProcessPoolWorker(Worker):
+
+    poll_interval = 0.1
+
+    def __init__(self,
+                 path: str,
+                 layer_name: str,
+                 job: ProcessJob,
+                 max_workers: int = None,
+                 chunks_per_worker: int = 4) -> None:
+        super().__init__()
+        self.path = path
+        self.layer_name = layer_name
+        self.job = job
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+
+    def _read_fids(self) -> np.ndarray:
+        with handle_pool().reader(self.path) as ds:
+            layer: ogr.Layer = ds.GetLayerByName(self.layer_name) if ds else None
+
+            if layer is None:
+                return np.array([], dtype=np.int64)
+
+            return np.asarray(read_columns(layer, columns=[], geometry=False)[FID_COLUMN])
+
+    def run(self) -> None:
+        fids = self._read_fids()
+        ranges = fid_ranges(fids, self.max_workers * self.chunks_per_worker)
+
+        if self.is_canceled:
+            self.signal.canceled.emit()
+            return
+
+        results = []
+        processed = 0
+
+        folder = tempfile.mkdtemp()
+        executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                       mp_context=multiprocessing.get_context("spawn"))
+        canceled = False
+        try:
+            pending: Dict[Future, str] = {}
+            for i, fid_range in enumerate(ranges):
+                output_file = os.path.join(folder, f"{i}.npy")
+                future = executor.submit(self.job, self.path, self.layer_name, fid_range,
+                                         output_file)
+                pending[future] = output_file
+
+            while pending:
+                done, _ = wait(pending.keys(), self.poll_interval, FIRST_COMPLETED)
+
+                if self.is_canceled:
+                    canceled = True
+                    break
+
+                for future in done:
+                    output_file = pending.pop(future)
+                    processed += future.result()
+                    results.append(np.load(output_file))
+                    self.signal.percentDone.emit(processed / max(1, fids.size) * 100)
+        finally:
+            executor.shutdown(wait=not canceled, cancel_futures=True)
+            shutil.rmtree(folder, ignore_errors=True)
+
+        if canceled:
+            self.signal.canceled.emit()
+            return
+
+        values = np.sort(np.concatenate(results)) if results else np.array([], dtype=np.int64)
+
+        self.signal.result.emit((self.layer_name, values))
+        self.signal.finished.emit()
@@ -0,0 +1,201 @@
+from dataclasses import dataclass, field
+from typing import List, Tuple
+import math
+
+import numpy as np
+
+from osgeo import gdal
+
+from .handlepool import handle_pool
+from .workers import Worker
+
+Window = Tuple[int, int, int, int]
+BandPlan = Tuple[int, Tuple[float, float], List[Window]]
+
+
+@dataclass
+class BandStatistics:
+    band: int
+    histogram_range: Tuple[float, float]
+    histogram: np.ndarray
+    count: int = 0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+    mean: float = 0.0
+    m2: float = field(default=0.0, repr=False)
+
+    @property
+    def std(self) -> float:
+        if self.count == 0:
+            return math.nan
+        return math.sqrt(self.m2 / self.count)
+
+    @classmethod
+    def empty(cls, band: int, histogram_range: Tuple[float, float],
+              bins: int) -> 'BandStatistics':
+        return cls(band=band,
+                   histogram_range=histogram_range,
+                   histogram=np.zeros(bins, dtype=np.int64))
+
+    @classmethod
+    def from_values(cls, band: int, values: np.ndarray, histogram_range: Tuple[float, float],
+                    bins: int) -> 'BandStatistics':
+        statistics = cls.empty(band, histogram_range, bins)
+
+        if values.size == 0:
+            return statistics
+
+        values = values.astype(np.float64, copy=False)
+        minimum, maximum = histogram_range
+
+        statistics.count = int(values.size)
+        statistics.minimum = float(values.min())
+        statistics.maximum = float(values.max())
+        statistics.mean = float(values.mean())
+        statistics.m2 = float(values.var() * values.size)
+        statistics.histogram, _ = np.histogram(np.clip(values, minimum, maximum),
+                                               bins=bins,
+                                               range=(minimum, maximum))
+
+        return statistics
+
+    def merge(self, other: 'BandStatistics') -> None:
+        if other.count == 0:
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.histogram += other.histogram
+
+
+def block_windows(band: gdal.Band, min_pixels: int = 1 << 20) -> List[Window]:
+    block_x, block_y = band.GetBlockSize()
+
+    if block_x * block_y < min_pixels:
+        block_y *= max(1, min_pixels // (block_x * block_y))
+
+    windows = []
+    for y_off in range(0, band.YSize, block_y):
+        height = min(block_y, band.YSize - y_off)
+        for x_off in range(0, band.XSize, block_x):
+            width = min(block_x, band.XSize - x_off)
+            windows.append((x_off, y_off, width, height))
+
+    return windows
+
+
+def valid_values(values: np.ndarray, nodata: float) -> np.ndarray:
+    values = values.ravel()
+    if np.issubdtype(values.dtype, np.floating):
+        values = values[np.isfinite(values)]
+    if nodata is not None:
+        values = values[values != nodata]
+    return values
+
+
+def histogram_range(band: gdal.Band, sample_size: int = 1024) -> Tuple[float, float]:
+    if band.DataType == gdal.GDT_Byte:
+        return 0, 256
+
+    statistics = band.GetStatistics(True, False)
+    if statistics and statistics[3] >= 0 and statistics[0] < statistics[1]:
+        return statistics[0], statistics[1]
+
+    sample = band.ReadAsArray(buf_xsize=min(band.XSize, sample_size),
+                              buf_ysize=min(band.YSize, sample_size))
+    sample = valid_values(sample, band.GetNoDataValue())
+
+    if sample.size == 0:
+        return 0, 1
+
+    minimum, maximum = float(sample.min()), float(sample.max())
+    if minimum == maximum:
+        maximum = minimum + 1
+    return minimum, maximum
+
+
+class RasterStatisticsPlanWorker(Worker):
+
+    def __init__(self, path: str, bands: List[int]) -> None:
+        super().__init__()
+        self.path = path
+        self.bands = bands
+
+    def run(self) -> None:
+        plans: List[BandPlan] = []
+
+        with handle_pool().reader(self.path) as ds:
+            if ds is None:
+                self.signal.finished.emit()
+                return
+
+            for band_number in self.bands:
+                if self.is_canceled:
+                    self.signal.canceled.emit()
+                    return
+
+                band: gdal.Band = ds.GetRasterBand(band_number)
+                plans.append((band_number, histogram_range(band), block_windows(band)))
+
+        self.signal.result.emit(plans)
+        self.signal.finished.emit()
+
+
+class RasterStatisticsWorker(Worker):
+
+    def __init__(self,
+                 path: str,
+                 band: int,
+                 windows: List[Window],
+                 histogram_range: Tuple[float, float],
+                 bins: int,
+                 windows_per_update: int = 8) -> None:
+        super().__init__()
+        self.path = path
+        self.band = band
+        self.windows = windows
+        self.histogram_range = histogram_range
+        self.bins = bins
+        self.windows_per_update = windows_per_update
+
+    def run(self) -> None:
+        with handle_pool().reader(self.path) as ds:
+            if ds is None:
+                self.signal.finished.emit()
+                return
+
+            self._read_windows(ds)
+
+    def _read_windows(self, ds: gdal.Dataset) -> None:
+        band: gdal.Band = ds.GetRasterBand(self.band)
+        nodata = band.GetNoDataValue()
+
+        partial = BandStatistics.empty(self.band, self.histogram_range, self.bins)
+        windows_read = 0
+
+        for x_off, y_off, width, height in self.windows:
+            if self.is_canceled:
+                self.signal.canceled.emit()
+                return
+
+            values = valid_values(band.ReadAsArray(x_off, y_off, width, height), nodata)
+
+            partial.merge(
+                BandStatistics.from_values(self.band, values, self.histogram_range, self.bins))
+            windows_read += 1
+
+            if windows_read % self.windows_per_update == 0:
+                self.signal.result.emit((partial, windows_read))
+                partial = BandStatistics.empty(self.band, self.histogram_range, self.bins)
+                windows_read = 0
+
+        if windows_read:
+            self.signal.result.emit((partial, windows_read))
+
+        self.signal.finished.emit()
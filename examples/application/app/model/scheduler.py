@@ -0,0 +1,262 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import heapq
+import itertools
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from .enums import Priority
+from .workers import Worker
+
+WRITER_CATEGORY_PREFIX = "writer:"
+
+
+def writer_category(path: str) -> str:
+    return f"{WRITER_CATEGORY_PREFIX}{path}"
+
+
+def job_error(future: 'JobFuture') -> str:
+    exception = future.exception()
+    if exception is not None:
+        return str(exception) or type(exception).__name__
+    return "Job finished without a result."
+
+
+@dataclass
+class SchedulerStatistics:
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    canceled: int = 0
+    failed: int = 0
+    max_queue_depth: int = 0
+    queued_by_category: Dict[str, int] = field(default_factory=dict)
+    running_by_category: Dict[str, int] = field(default_factory=dict)
+
+
+class JobFuture(QObject):
+
+    resolved = pyqtSignal(object)
+    canceled = pyqtSignal()
+    failed = pyqtSignal(object)
+
+    def __init__(self, worker: Worker, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.worker = worker
+        self._done = False
+        self._result: Any = None
+        self._exception: Exception = None
+        self._callbacks: List[Callable[['JobFuture'], None]] = []
+
+        worker.signal.result.connect(self._set_result)
+
+    def done(self) -> bool:
+        return self._done
+
+    def cancelled(self) -> bool:
+        return self._done and self.worker.is_canceled
+
+    def result(self) -> Any:
+        return self._result
+
+    def exception(self) -> Exception:
+        return self._exception
+
+    def cancel(self) -> None:
+        self.worker.cancel()
+
+    def add_done_callback(self, callback: Callable[['JobFuture'], None]) -> None:
+        if self._done:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def _set_result(self, result: Any) -> None:
+        self._result = result
+
+    def _resolve(self, exception: Exception = None) -> None:
+        if self._done:
+            return
+
+        self._done = True
+        self._exception = exception
+
+        if exception is not None:
+            self.failed.emit(exception)
+        elif self.worker.is_canceled:
+            self.canceled.emit()
+        else:
+            self.resolved.emit(self._result)
+
+        for callback in self._callbacks:
+            callback(self)
+        self._callbacks = []
+
+
+class JobSignals(QObject):
+    done = pyqtSignal(object)
+
+
+class Job(QRunnable):
+
+    def __init__(self, worker: Worker, priority: Priority, category: str, sequence: int) -> None:
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signal = JobSignals()
+        self.worker = worker
+        self.priority = priority
+        self.category = category
+        self.sequence = sequence
+        self.future = JobFuture(worker)
+
+    def sort_key(self) -> Tuple[int, int]:
+        return -int(self.priority), self.sequence
+
+    def run(self) -> None:
+        exception = None
+        try:
+            self.worker.run()
+        except Exception as e:
+            exception = e
+        self.signal.done.emit(exception)
+
+
+class JobScheduler(QObject):
+
+    queueDepthChanged = pyqtSignal(int)
+
+    def __init__(self,
+                 max_thread_count: int = None,
+                 interactive_threads: int = 1,
+                 parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+
+        self._interactive_threads = max(0, interactive_threads)
+
+        self._threadpool = QThreadPool(self)
+        if max_thread_count:
+            self._threadpool.setMaxThreadCount(max_thread_count)
+
+        self._queue: List[Tuple[Tuple[int, int], Job]] = []
+        self._running: List[Job] = []
+        self._category_limits: Dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._statistics = SchedulerStatistics()
+
+    @property
+    def max_thread_count(self) -> int:
+        return self._threadpool.maxThreadCount()
+
+    def set_max_thread_count(self, max_thread_count: int) -> None:
+        self._threadpool.setMaxThreadCount(max(1, max_thread_count))
+        self._dispatch()
+
+    @property
+    def background_thread_count(self) -> int:
+        return max(1, self.max_thread_count - self._interactive_threads)
+
+    def category_limit(self, category: str) -> Optional[int]:
+        if category in self._category_limits:
+            return self._category_limits[category]
+        if category and category.startswith(WRITER_CATEGORY_PREFIX):
+            return 1
+        return None
+
+    def set_category_limit(self, category: str, limit: Optional[int]) -> None:
+        if limit is None:
+            self._category_limits.pop(category, None)
+        else:
+            self._category_limits[category] = max(1, limit)
+        self._dispatch()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    @property
+    def statistics(self) -> SchedulerStatistics:
+        self._statistics.queued = len(self._queue)
+        self._statistics.running = len(self._running)
+        self._statistics.queued_by_category = self._count_categories(job for _, job in self._queue)
+        self._statistics.running_by_category = self._count_categories(self._running)
+        return self._statistics
+
+    def submit(self,
+               worker: Worker,
+               priority: Priority = Priority.NORMAL,
+               category: str = None) -> JobFuture:
+        job = Job(worker, priority, category, next(self._sequence))
+        job.signal.done.connect(lambda exception, job=job: self._job_done(job, exception))
+
+        heapq.heappush(self._queue, (job.sort_key(), job))
+        self._statistics.max_queue_depth = max(self._statistics.max_queue_depth,
+                                               len(self._queue))
+
+        self._dispatch()
+        return job.future
+
+    def cancel_all(self, category: str = None) -> None:
+        for _, job in self._queue:
+            if category is None or job.category == category:
+                job.worker.cancel()
+        for job in self._running:
+            if category is None or job.category == category:
+                job.worker.cancel()
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        skipped = []
+
+        while self._queue and len(self._running) < self._threadpool.maxThreadCount():
+            sort_key, job = heapq.heappop(self._queue)
+
+            if job.worker.is_canceled:
+                self._statistics.canceled += 1
+                job.future._resolve()
+                continue
+
+            limit = self.category_limit(job.category)
+            if limit is not None and self._running_in_category(job.category) >= limit:
+                skipped.append((sort_key, job))
+                continue
+
+            if (job.priority < Priority.HIGH and
+                    self._running_in_background() >= self.background_thread_count):
+                skipped.append((sort_key, job))
+                continue
+
+            self._running.append(job)
+            self._threadpool.start(job)
+
+        for item in skipped:
+            heapq.heappush(self._queue, item)
+
+        self.queueDepthChanged.emit(len(self._queue))
+
+    def _job_done(self, job: Job, exception: Exception) -> None:
+        if job in self._running:
+            self._running.remove(job)
+
+        if exception is not None:
+            self._statistics.failed += 1
+        elif job.worker.is_canceled:
+            self._statistics.canceled += 1
+        else:
+            self._statistics.completed += 1
+
+        job.future._resolve(exception)
+        self._dispatch()
+
+    def _running_in_background(self) -> int:
+        return sum(1 for job in self._running if job.priority < Priority.HIGH)
+
+    def _running_in_category(self, category: str) -> int:
+        return sum(1 for job in self._running if job.category == category)
+
+    @staticmethod
+    def _count_categories(jobs) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for job in jobs:
+            if job.category:
+                counts[job.category] = counts.get(job.category, 0) + 1
+        return counts
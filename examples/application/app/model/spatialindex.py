@@ -0,0 +1,195 @@
+from array import array
+from typing import List, Tuple
+import heapq
+import math
+
+import numpy as np
+
+from osgeo import ogr
+
+from .columnar import BoundingBox
+from .handlepool import handle_pool
+from .workers import Worker
+
+Level = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _str_order(bounds: np.ndarray, node_capacity: int) -> np.ndarray:
+    count = len(bounds)
+    centers_x = (bounds[:, 0] + bounds[:, 2]) / 2
+    centers_y = (bounds[:, 1] + bounds[:, 3]) / 2
+
+    nodes = math.ceil(count / node_capacity)
+    slab_size = math.ceil(math.sqrt(nodes)) * node_capacity
+
+    rank_x = np.empty(count, dtype=np.int64)
+    rank_x[np.argsort(centers_x, kind="stable")] = np.arange(count)
+
+    return np.lexsort((centers_y, rank_x // slab_size))
+
+
+def _group(bounds: np.ndarray, node_capacity: int) -> Level:
+    starts = np.arange(0, len(bounds), node_capacity, dtype=np.int64)
+    ends = np.minimum(starts + node_capacity, len(bounds))
+
+    node_bounds = np.column_stack([
+        np.minimum.reduceat(bounds[:, 0], starts),
+        np.minimum.reduceat(bounds[:, 1], starts),
+        np.maximum.reduceat(bounds[:, 2], starts),
+        np.maximum.reduceat(bounds[:, 3], starts),
+    ])
+
+    return node_bounds, starts, ends
+
+
+def _expand(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    counts = ends - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.array([], dtype=np.int64)
+    offsets = starts - (np.cumsum(counts) - counts)
+    return np.repeat(offsets, counts) + np.arange(total)
+
+
+def _intersects(bounds: np.ndarray, bbox: BoundingBox) -> np.ndarray:
+    min_x, min_y, max_x, max_y = bbox
+    return ((bounds[:, 0] <= max_x) & (bounds[:, 2] >= min_x) & (bounds[:, 1] <= max_y) &
+            (bounds[:, 3] >= min_y))
+
+
+def _distance(bounds: np.ndarray, x: float, y: float) -> np.ndarray:
+    dx = np.maximum(np.maximum(bounds[:, 0] - x, x - bounds[:, 2]), 0)
+    dy = np.maximum(np.maximum(bounds[:, 1] - y, y - bounds[:, 3]), 0)
+    return np.hypot(dx, dy)
+
+
+class STRTree:
+
+    def __init__(self, ids: np.ndarray, bounds: np.ndarray, node_capacity: int = 16) -> None:
+        self._node_capacity = max(2, node_capacity)
+        self._levels: List[Level] = []
+
+        ids = np.asarray(ids, dtype=np.int64)
+        bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+
+        if len(bounds) == 0:
+            self._ids = ids
+            self._bounds = bounds
+            return
+
+        order = _str_order(bounds, self._node_capacity)
+        self._ids = ids[order]
+        self._bounds = bounds[order]
+
+        child_bounds = self._bounds
+        while True:
+            node_bounds, starts, ends = _group(child_bounds, self._node_capacity)
+
+            if len(node_bounds) > 1:
+                order = _str_order(node_bounds, self._node_capacity)
+                node_bounds, starts, ends = node_bounds[order], starts[order], ends[order]
+
+            self._levels.append((node_bounds, starts, ends))
+
+            if len(node_bounds) == 1:
+                break
+
+            child_bounds = node_bounds
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def extent(self) -> BoundingBox:
+        if not self._levels:
+            return None
+        return tuple(float(value) for value in self._levels[-1][0][0])
+
+    def _children_bounds(self, level: int) -> np.ndarray:
+        if level == 0:
+            return self._bounds
+        return self._levels[level - 1][0]
+
+    def query(self, bbox: BoundingBox) -> np.ndarray:
+        if not self._levels:
+            return np.array([], dtype=np.int64)
+
+        nodes = np.arange(len(self._levels[-1][0]))
+
+        for level in range(len(self._levels) - 1, -1, -1):
+            node_bounds, starts, ends = self._levels[level]
+            hits = nodes[_intersects(node_bounds[nodes], bbox)]
+            nodes = _expand(starts[hits], ends[hits])
+
+        return self._ids[nodes[_intersects(self._bounds[nodes], bbox)]]
+
+    def nearest(self, x: float, y: float, k: int = 1) -> np.ndarray:
+        if not self._levels:
+            return np.array([], dtype=np.int64)
+
+        top = len(self._levels) - 1
+        heap = [(float(distance), top, node)
+                for node, distance in enumerate(_distance(self._levels[top][0], x, y))]
+        heapq.heapify(heap)
+
+        result = []
+        while heap and len(result) < k:
+            _, level, index = heapq.heappop(heap)
+
+            if level < 0:
+                result.append(self._ids[index])
+                continue
+
+            _, starts, ends = self._levels[level]
+            children = np.arange(starts[index], ends[index])
+            distances = _distance(self._children_bounds(level)[children], x, y)
+
+            for child, distance in zip(children.tolist(), distances.tolist()):
+                heapq.heappush(heap, (distance, level - 1, child))
+
+        return np.array(result, dtype=np.int64)
+
+
+class SpatialIndexWorker(Worker):
+
+    def __init__(self, path: str, layer_name: str, node_capacity: int = 16) -> None:
+        super().__init__()
+        self.path = path
+        self.layer_name = layer_name
+        self.node_capacity = node_capacity
+
+    def run(self) -> None:
+        fids = array("q")
+        bounds = array("d")
+
+        with handle_pool().reader(self.path) as ds:
+            layer: ogr.Layer = ds.GetLayerByName(self.layer_name) if ds else None
+
+            if layer is None:
+                self.signal.finished.emit()
+                return
+
+            layerDef: ogr.FeatureDefn = layer.GetLayerDefn()
+            layer.SetIgnoredFields(
+                [layerDef.GetFieldDefn(i).GetName() for i in range(layerDef.GetFieldCount())] +
+                ["OGR_STYLE"])
+
+            feature: ogr.Feature = layer.GetNextFeature()
+            while feature is not None:
+                if self.is_canceled:
+                    self.signal.canceled.emit()
+                    return
+
+                geometry: ogr.Geometry = feature.GetGeometryRef()
+                if geometry is not None and not geometry.IsEmpty():
+                    min_x, max_x, min_y, max_y = geometry.GetEnvelope()
+                    fids.append(feature.GetFID())
+                    bounds.extend((min_x, min_y, max_x, max_y))
+
+                feature = layer.GetNextFeature()
+
+        tree = STRTree(np.frombuffer(fids, dtype=np.int64),
+                       np.frombuffer(bounds, dtype=np.float64), self.node_capacity)
+
+        self.signal.result.emit((self.layer_name, tree))
+        self.signal.finished.emit()
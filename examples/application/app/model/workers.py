@@ -0,0 +1,508 @@
+from typing import List, Optional, Tuple
+import os
+import time
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from osgeo import gdal, ogr
+
+from .drivers import (DCAP_CREATE_LAYER, DCAP_DELETE_LAYER, driver_catalogue,
+                      driver_has_layer_capability, open_flags)
+from .enums import DataType
+from .handlepool import handle_pool
+
+
+def open_dataset(path: str,
+                 driver: gdal.Driver = None,
+                 update: bool = False) -> Tuple[DataType, gdal.Dataset]:
+
+    allowed_drivers = [driver.ShortName] if driver else None
+    ds: gdal.Dataset = gdal.OpenEx(path, open_flags(driver, update),
+                                   allowed_drivers=allowed_drivers)
+
+    if ds is None:
+        return DataType.NONE, None
+
+    if ds.RasterCount > 0 and ds.GetLayerCount() == 0:
+        return DataType.RASTER, ds
+
+    if ds.GetLayerCount() > 0:
+        return DataType.VECTOR, ds
+
+    return DataType.NONE, None
+
+
+def layer_capabilities(path: str, driver: gdal.Driver) -> Tuple[bool, bool]:
+    create = driver_has_layer_capability(driver, DCAP_CREATE_LAYER)
+    delete = driver_has_layer_capability(driver, DCAP_DELETE_LAYER)
+
+    if not (create or delete) or not os.access(path, os.W_OK):
+        return False, False
+
+    data_type, ds = open_dataset(path, driver, update=True)
+    if data_type != DataType.VECTOR:
+        return False, False
+
+    return (create and bool(ds.TestCapability(ogr.ODsCCreateLayer)),
+            delete and bool(ds.TestCapability(ogr.ODsCDeleteLayer)))
+
+
+def read_layers_names(ds: ogr.DataSource) -> List[str]:
+    return [ds.GetLayerByIndex(i).GetName() for i in range(ds.GetLayerCount())]
+
+
+def delete_layer(ds: gdal.Dataset, layer_name: str) -> None:
+    for i in range(ds.GetLayerCount()):
+        if ds.GetLayer(i).GetName() == layer_name:
+            ds.DeleteLayer(i)
+            return
+
+
+def abort_layer_write(ds: gdal.Dataset, layer_name: str, rollback: bool) -> str:
+    error = gdal.GetLastErrorMsg() or f"Writing layer {layer_name} failed."
+    if rollback:
+        ds.RollbackTransaction()
+    delete_layer(ds, layer_name)
+    return error
+
+
+def create_layer_like(ds: gdal.Dataset, source: ogr.Layer,
+                      layer_name: str) -> Tuple[Optional[ogr.Layer], str]:
+    sourceDef: ogr.FeatureDefn = source.GetLayerDefn()
+    driver_info = driver_catalogue().driver(ds.GetDriver().ShortName)
+
+    options = ["OVERWRITE=YES"]
+    geom_type = ogr.wkbNone
+    srs = None
+
+    if sourceDef.GetGeomFieldCount() > 0:
+        geom_field: ogr.GeomFieldDefn = sourceDef.GetGeomFieldDefn(0)
+        geom_type = geom_field.GetType()
+        srs = geom_field.GetSpatialRef()
+        if (geom_field.GetName() and driver_info and
+                driver_info.supports_layer_creation_option("GEOMETRY_NAME")):
+            options.append(f"GEOMETRY_NAME={geom_field.GetName()}")
+
+    if (source.GetFIDColumn() and driver_info and
+            driver_info.supports_layer_creation_option("FID")):
+        options.append(f"FID={source.GetFIDColumn()}")
+
+    new_layer: ogr.Layer = ds.CreateLayer(layer_name, srs=srs, geom_type=geom_type,
+                                          options=options)
+    if new_layer is None:
+        return None, gdal.GetLastErrorMsg()
+
+    for i in range(1, sourceDef.GetGeomFieldCount()):
+        if new_layer.CreateGeomField(sourceDef.GetGeomFieldDefn(i)) != ogr.OGRERR_NONE:
+            return None, abort_layer_write(ds, new_layer.GetName(), False)
+
+    for i in range(sourceDef.GetFieldCount()):
+        if new_layer.CreateField(sourceDef.GetFieldDefn(i)) != ogr.OGRERR_NONE:
+            return None, abort_layer_write(ds, new_layer.GetName(), False)
+
+    return new_layer, None
+
+
+def export_translate_options(layer_name: str,
+                             driver_name: str = None,
+                             group_transactions: int = None,
+                             layer_creation_options: List[str] = None,
+                             callback=None) -> gdal.VectorTranslateOptions:
+    options = []
+    if group_transactions:
+        options.extend(["-gt", str(group_transactions)])
+
+    return gdal.VectorTranslateOptions(options=options,
+                                       format=driver_name,
+                                       layers=[layer_name],
+                                       layerName=layer_name,
+                                       layerCreationOptions=layer_creation_options,
+                                       callback=callback)
+
+
+class WorkerSignals(QObject):
+    finished = pyqtSignal()
+    canceled = pyqtSignal()
+    percentDone = pyqtSignal(float)
+    result = pyqtSignal(object)
+
+
+class CancellationToken:
+
+    def __init__(self) -> None:
+        self._canceled = False
+
+    def cancel(self) -> None:
+        self._canceled = True
+
+    @property
+    def is_canceled(self) -> bool:
+        return self._canceled
+
+
+class Worker(QRunnable):
+
+    def __init__(self, token: CancellationToken = None) -> None:
+        super().__init__()
+        self.signal = WorkerSignals()
+        self.token = token or CancellationToken()
+
+    def cancel(self) -> None:
+        self.token.cancel()
+
+    @property
+    def is_canceled(self) -> bool:
+        return self.token.is_canceled
+
+
+class OpenDatasetWorker(Worker):
+
+    def __init__(self, path: str, driver_name: str = None) -> None:
+        super().__init__()
+        self.path = path
+        self.driver_name = driver_name
+
+    def run(self) -> None:
+        driver: gdal.Driver = None
+        if self.driver_name:
+            driver = gdal.GetDriverByName(self.driver_name)
+        if driver is None:
+            driver = gdal.IdentifyDriver(self.path)
+        self.signal.percentDone.emit(50)
+
+        if self.is_canceled:
+            self.signal.canceled.emit()
+            return
+
+        if driver is None:
+            self.signal.finished.emit()
+            return
+
+        data_type, ds = open_dataset(self.path, driver)
+
+        layers_names = []
+        capabilities = (False, False)
+        if data_type == DataType.VECTOR:
+            layers_names = read_layers_names(ds)
+            capabilities = layer_capabilities(self.path, driver)
+
+        if self.is_canceled:
+            ds = None
+            self.signal.canceled.emit()
+            return
+
+        self.signal.percentDone.emit(100)
+        self.signal.result.emit((driver, data_type, ds, layers_names, capabilities))
+        self.signal.finished.emit()
+
+
+class FeatureCountWorker(Worker):
+
+    def __init__(self, path: str, layer_name: str) -> None:
+        super().__init__()
+        self.path = path
+        self.layer_name = layer_name
+
+    def run(self) -> None:
+        count = -1
+
+        with handle_pool().reader(self.path) as ds:
+            if ds and not self.is_canceled:
+                layer: ogr.Layer = ds.GetLayerByName(self.layer_name)
+                if layer:
+                    count = layer.GetFeatureCount()
+
+        if self.is_canceled:
+            self.signal.canceled.emit()
+            return
+
+        self.signal.result.emit(count)
+        self.signal.finished.emit()
+
+
+class SqlPreviewWorker(Worker):
+
+    def __init__(self, path: str, sql: str, sql_flavor: str) -> None:
+        super().__init__()
+        self.path = path
+        self.sql = sql
+        self.sql_flavor = sql_flavor
+
+    def run(self) -> None:
+        if self.is_canceled:
+            self.signal.canceled.emit()
+            return
+
+        count = -1
+        has_features = False
+        error: str = None
+
+        with handle_pool().reader(self.path) as ds:
+            if ds:
+                sql_layer: ogr.Layer = ds.ExecuteSQL(self.sql, dialect=self.sql_flavor)
+                if sql_layer is None:
+                    error = gdal.GetLastErrorMsg()
+                else:
+                    if not self.is_canceled:
+                        count = sql_layer.GetFeatureCount(force=0)
+                        if count < 0 and not self.is_canceled:
+                            has_features = sql_layer.GetNextFeature() is not None
+                        else:
+                            has_features = count > 0
+                    ds.ReleaseResultSet(sql_layer)
+
+        if self.is_canceled:
+            self.signal.canceled.emit()
+            return
+
+        self.signal.result.emit((count, has_features, error))
+        self.signal.finished.emit()
+
+
+class ExportLayerWorker(Worker):
+
+    def __init__(self,
+                 path: str,
+                 layer_name: str,
+                 file_name: str,
+                 driver_name: str = None,
+                 group_transactions: int = None,
+                 layer_creation_options: List[str] = None) -> None:
+        super().__init__()
+        self.path = path
+        self.layer_name = layer_name
+        self.file_name = file_name
+        self.driver_name = driver_name
+        self.group_transactions = group_transactions
+        self.layer_creation_options = layer_creation_options
+        self._last_percent = -1
+
+    def _progress(self, complete: float, message: str, data) -> int:
+        percent = int(complete * 100)
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.signal.percentDone.emit(percent)
+        return 0 if self.is_canceled else 1
+
+    def run(self) -> None:
+        options = export_translate_options(self.layer_name, self.driver_name,
+                                           self.group_transactions, self.layer_creation_options,
+                                           self._progress)
+        with handle_pool().reader(self.path) as source_ds:
+            ds = gdal.VectorTranslate(self.file_name, source_ds.dataset, options=options)
+            success = ds is not None and not self.is_canceled
+            ds = None
+
+        if self.is_canceled:
+            self.signal.canceled.emit()
+
+        self.signal.result.emit((self.file_name, success))
+        self.signal.finished.emit()
+
+
+class MaterializeSqlSignals(WorkerSignals):
+    chunkCommitted = pyqtSignal(int, float)
+
+
+class MaterializeSqlWorker(Worker):
+
+    def __init__(self,
+                 path: str,
+                 sql: str,
+                 sql_flavor: str,
+                 layer_name: str,
+                 driver_name: str = None,
+                 chunk_size: int = 10000) -> None:
+        super().__init__()
+        self.signal = MaterializeSqlSignals()
+        self.path = path
+        self.sql = sql
+        self.sql_flavor = sql_flavor
+        self.layer_name = layer_name
+        self.driver_name = driver_name
+        self.chunk_size = max(1, chunk_size)
+        self.error: str = None
+
+    def run(self) -> None:
+        with handle_pool().writer_lock(self.path):
+            driver = gdal.GetDriverByName(self.driver_name) if self.driver_name else None
+            _, ds = open_dataset(self.path, driver, update=True)
+
+            written = 0
+            if ds is None:
+                self.error = gdal.GetLastErrorMsg()
+            else:
+                written = self._materialize(ds)
+                ds.FlushCache()
+            ds = None
+
+        if self.is_canceled:
+            self.signal.canceled.emit()
+
+        self.signal.result.emit((self.layer_name, written, self.error))
+        self.signal.finished.emit()
+
+    def _materialize(self, ds: gdal.Dataset) -> int:
+        sql_layer: ogr.Layer = ds.ExecuteSQL(self.sql, dialect=self.sql_flavor)
+
+        if sql_layer is None:
+            self.error = gdal.GetLastErrorMsg()
+            return 0
+
+        try:
+            return self._copy_features(ds, sql_layer)
+        finally:
+            ds.ReleaseResultSet(sql_layer)
+
+    def _copy_features(self, ds: gdal.Dataset, sql_layer: ogr.Layer) -> int:
+        total = sql_layer.GetFeatureCount(force=0)
+
+        new_layer, self.error = create_layer_like(ds, sql_layer, self.layer_name)
+        if new_layer is None:
+            return 0
+
+        newLayerDef: ogr.FeatureDefn = new_layer.GetLayerDefn()
+        use_transaction = ds.TestCapability(ogr.ODsCTransactions)
+
+        written = 0
+        in_chunk = 0
+        start = time.perf_counter()
+
+        if use_transaction and ds.StartTransaction() != ogr.OGRERR_NONE:
+            self.error = abort_layer_write(ds, new_layer.GetName(), False)
+            return 0
+
+        feature: ogr.Feature = sql_layer.GetNextFeature()
+        while feature is not None:
+            if self.is_canceled:
+                abort_layer_write(ds, new_layer.GetName(), use_transaction)
+                return 0
+
+            new_feature = ogr.Feature(newLayerDef)
+            new_feature.SetFrom(feature)
+            if new_layer.CreateFeature(new_feature) != ogr.OGRERR_NONE:
+                self.error = abort_layer_write(ds, new_layer.GetName(), use_transaction)
+                return 0
+
+            written += 1
+            in_chunk += 1
+
+            if in_chunk == self.chunk_size:
+                if use_transaction and (ds.CommitTransaction() != ogr.OGRERR_NONE or
+                                        ds.StartTransaction() != ogr.OGRERR_NONE):
+                    self.error = abort_layer_write(ds, new_layer.GetName(), False)
+                    return 0
+                in_chunk = 0
+                self._report(written, total, start)
+
+            feature = sql_layer.GetNextFeature()
+
+        if use_transaction and ds.CommitTransaction() != ogr.OGRERR_NONE:
+            self.error = abort_layer_write(ds, new_layer.GetName(), False)
+            return 0
+
+        self._report(written, total, start)
+        return written
+
+    def _report(self, written: int, total: int, start: float) -> None:
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        self.signal.chunkCommitted.emit(written, written / elapsed)
+        if total > 0:
+            self.signal.percentDone.emit(min(100, written / total * 100))
+
+
+class ExtractFeaturesWorker(Worker):
+
+    def __init__(self,
+                 path: str,
+                 layer_name: str,
+                 fids: List[int],
+                 extent: Tuple[float, float, float, float],
+                 new_layer_name: str,
+                 driver_name: str = None) -> None:
+        super().__init__()
+        self.path = path
+        self.layer_name = layer_name
+        self.fids = fids
+        self.extent = extent
+        self.new_layer_name = new_layer_name
+        self.driver_name = driver_name
+        self.error: str = None
+
+    def run(self) -> None:
+        with handle_pool().writer_lock(self.path):
+            driver = gdal.GetDriverByName(self.driver_name) if self.driver_name else None
+            _, ds = open_dataset(self.path, driver, update=True)
+
+            written = 0
+            if ds is None:
+                self.error = gdal.GetLastErrorMsg()
+            else:
+                written = self._extract(ds)
+                ds.FlushCache()
+            ds = None
+
+        if self.is_canceled:
+            self.signal.canceled.emit()
+
+        self.signal.result.emit((self.new_layer_name, written, self.error))
+        self.signal.finished.emit()
+
+    def _features(self, layer: ogr.Layer):
+        if layer.TestCapability(ogr.OLCRandomRead):
+            for fid in self.fids:
+                feature = layer.GetFeature(fid)
+                if feature is not None:
+                    yield feature
+            return
+
+        fids = set(self.fids)
+        min_x, min_y, max_x, max_y = self.extent
+        layer.SetSpatialFilterRect(min_x, min_y, max_x, max_y)
+
+        feature: ogr.Feature = layer.GetNextFeature()
+        while feature is not None:
+            if feature.GetFID() in fids:
+                yield feature
+            feature = layer.GetNextFeature()
+
+    def _extract(self, ds: gdal.Dataset) -> int:
+        layer: ogr.Layer = ds.GetLayerByName(self.layer_name)
+        if layer is None:
+            self.error = gdal.GetLastErrorMsg()
+            return 0
+
+        new_layer, self.error = create_layer_like(ds, layer, self.new_layer_name)
+        if new_layer is None:
+            return 0
+
+        newLayerDef: ogr.FeatureDefn = new_layer.GetLayerDefn()
+        use_transaction = ds.TestCapability(ogr.ODsCTransactions)
+
+        if use_transaction and ds.StartTransaction() != ogr.OGRERR_NONE:
+            self.error = abort_layer_write(ds, new_layer.GetName(), False)
+            return 0
+
+        total = len(self.fids)
+        written = 0
+        for feature in self._features(layer):
+            if self.is_canceled:
+                abort_layer_write(ds, new_layer.GetName(), use_transaction)
+                return 0
+
+            new_feature = ogr.Feature(newLayerDef)
+            new_feature.SetFrom(feature)
+            if new_layer.CreateFeature(new_feature) != ogr.OGRERR_NONE:
+                self.error = abort_layer_write(ds, new_layer.GetName(), use_transaction)
+                return 0
+
+            written += 1
+            if total and written % 1000 == 0:
+                self.signal.percentDone.emit(min(100, written / total * 100))
+
+        if use_transaction and ds.CommitTransaction() != ogr.OGRERR_NONE:
+            self.error = abort_layer_write(ds, new_layer.GetName(), False)
+            return 0
+
+        self.signal.percentDone.emit(100)
+        return written
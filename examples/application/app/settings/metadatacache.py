@@ -0,0 +1,149 @@
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import json
+import os
+
+from PyQt5.QtCore import QCoreApplication, QObject, QTimer
+
+from ..model.layerinfo import LayerInfo
+
+FileSignature = Tuple[int, int]
+DatasetSignature = Tuple[FileSignature, ...]
+
+
+def file_signature(path: str) -> Optional[FileSignature]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def dataset_signature(files: List[str]) -> Optional[DatasetSignature]:
+    signatures = []
+    for path in files:
+        signature = file_signature(path)
+        if signature is None:
+            return None
+        signatures.append(signature)
+    return tuple(signatures)
+
+
+@dataclass
+class DatasetMetadata:
+    path: str
+    files: List[str]
+    signature: DatasetSignature
+    driver_name: str
+    data_type: str
+    layers_names: List[str] = field(default_factory=list)
+    raster_band_count: int = 0
+    allow_create_layer: bool = False
+    allow_delete_layer: bool = False
+    layers: Dict[str, LayerInfo] = field(default_factory=dict)
+
+    def to_json(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_json(cls, values: dict) -> 'DatasetMetadata':
+        layers = {}
+        for name, layer in values.get("layers", {}).items():
+            layer["geometry_fields"] = [tuple(field) for field in layer["geometry_fields"]]
+            layer["attribute_fields"] = [tuple(field) for field in layer["attribute_fields"]]
+            layers[name] = LayerInfo(**layer)
+
+        values = dict(values,
+                      layers=layers,
+                      signature=tuple(tuple(signature) for signature in values["signature"]))
+        return cls(**values)
+
+
+class MetadataCache(QObject):
+
+    def __init__(self,
+                 max_entries: int = 50,
+                 save_delay: int = 2000,
+                 parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+
+        self._path_cache = Path(__file__).parent.parent / "metadata_cache.json"
+        self._max_entries = max_entries
+        self._entries: 'OrderedDict[str, DatasetMetadata]' = None
+
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(save_delay)
+        self._save_timer.timeout.connect(self.save)
+
+        app = QCoreApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.flush)
+
+    def _load(self) -> None:
+        if self._entries is not None:
+            return
+
+        self._entries = OrderedDict()
+
+        try:
+            with open(self._path_cache, encoding="utf-8") as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        for values in entries:
+            try:
+                metadata = DatasetMetadata.from_json(values)
+            except (KeyError, TypeError):
+                continue
+            self._entries[metadata.path] = metadata
+
+    def save_later(self) -> None:
+        self._save_timer.start()
+
+    def flush(self) -> None:
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self.save()
+
+    def save(self) -> None:
+        self._save_timer.stop()
+
+        if self._entries is None:
+            return
+
+        path_tmp = self._path_cache.with_suffix(".tmp")
+        try:
+            with open(path_tmp, "w", encoding="utf-8") as file:
+                json.dump([metadata.to_json() for metadata in self._entries.values()], file)
+            os.replace(path_tmp, self._path_cache)
+        except OSError:
+            pass
+
+    def get(self, path: str) -> Optional[DatasetMetadata]:
+        self._load()
+
+        metadata = self._entries.get(path)
+        if metadata is None:
+            return None
+
+        if metadata.signature != dataset_signature(metadata.files):
+            del self._entries[path]
+            return None
+
+        self._entries.move_to_end(path)
+        return metadata
+
+    def put(self, metadata: DatasetMetadata) -> None:
+        self._load()
+
+        self._entries[metadata.path] = metadata
+        self._entries.move_to_end(metadata.path)
+
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+        self.save_later()
@@ -0,0 +1,78 @@
+from typing import Optional, Union
+import sys
+
+from PyQt5.QtWidgets import QWidget, QApplication
+from PyQt5.QtCore import Qt, QRect, QPointF
+from PyQt5.QtGui import QPainter, QBrush, QColor, QPaintEvent, QPen, QPixmap, QResizeEvent
+
+
+class CustomPaintWidget(QWidget):
+
+    _brush_rectangle: QBrush = None
+    _brush_circle: QBrush = None
+    _pen_circle: QPen = None
+
+    def __init__(self,
+                 parent: Optional[QWidget] = None,
+                 flags: Union[Qt.WindowFlags, Qt.WindowType] = Qt.WindowType.Widget) -> None:
+        super().__init__(parent, flags)
+        self._cache: QPixmap = None
+
+    @classmethod
+    def _create_brushes_and_pens(cls) -> None:
+        if cls._brush_rectangle is None:
+            cls._brush_rectangle = QBrush(QColor("#ff0000"), Qt.BrushStyle.SolidPattern)
+            cls._brush_circle = QBrush(QColor("#00ff00"), Qt.BrushStyle.SolidPattern)
+            cls._pen_circle = QPen(QColor("#0000ff"), Qt.PenStyle.SolidLine)
+
+    def render_cache(self) -> QPixmap:
+
+        self._create_brushes_and_pens()
+
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+
+        painter.fillRect(
+            QRect(int(self.width() * 0.1), int(self.height() * 0.1), int(self.width() * 0.8),
+                  int(self.height() * 0.8)), self._brush_rectangle)
+
+        painter.save()
+
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        painter.setBrush(self._brush_circle)
+        painter.setPen(self._pen_circle)
+
+        radius = min(self.width() / 4, self.height() / 4)
+
+        painter.drawEllipse(QPointF(self.width() / 2, self.height() / 2), radius, radius)
+
+        painter.restore()
+
+        painter.end()
+
+        return pixmap
+
+    def resizeEvent(self, a0: QResizeEvent) -> None:
+        self._cache = None
+        return super().resizeEvent(a0)
+
+    def paintEvent(self, e: QPaintEvent):
+
+        if self._cache is None or self._cache.devicePixelRatioF() != self.devicePixelRatioF():
+            self._cache = self.render_cache()
+
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._cache)
+
+
+if __name__ == "__main__":
+
+    app = QApplication([])
+    w = CustomPaintWidget()
+    w.show()
+    sys.exit(app.exec())
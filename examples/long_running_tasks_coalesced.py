@@ -0,0 +1,163 @@
+from typing import Optional, Dict
+import threading
+import time
+from datetime import datetime
+import uuid
+import sys
+
+from PyQt5.QtCore import (QRunnable, pyqtSignal, QObject, QThreadPool, QTimer)
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QPushButton, QPlainTextEdit,
+                             QApplication, QLabel, QProgressBar)
+
+
+class ProgressBus(QObject):
+
+    percentDone = pyqtSignal(str, float)
+
+    def __init__(self, frame_rate: int = 30, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+
+        self._lock = threading.Lock()
+        self._progress: Dict[str, float] = {}
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(1000 / frame_rate))
+        self.timer.timeout.connect(self.flush)
+
+    def start(self) -> None:
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def stop(self) -> None:
+        self.timer.stop()
+        self.flush()
+
+    def report_progress(self, job_name: str, percent: float) -> None:
+        with self._lock:
+            self._progress[job_name] = percent
+
+    def flush(self) -> None:
+        with self._lock:
+            progress = self._progress
+            self._progress = {}
+
+        for job_name, percent in progress.items():
+            self.percentDone.emit(job_name, percent)
+
+
+class WorkerSignals(QObject):
+    finished = pyqtSignal()
+    result = pyqtSignal(str)
+
+
+class Worker(QRunnable):
+
+    def __init__(self, job_name: str, bus: ProgressBus):
+        super(Worker, self).__init__()
+        self.signal = WorkerSignals()
+        self.job_name = job_name
+        self.bus = bus
+
+    def run(self):
+        for i in range(10):
+            time.sleep(1)
+            self.bus.report_progress(self.job_name, ((i + 1) / 10) * 100)
+        self.signal.finished.emit()
+        self.signal.result.emit("Job `{}` is done.".format(self.job_name))
+
+
+class MainWindow(QMainWindow):
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+
+        self.setWindowTitle("Long Running Tasks")
+        self.setMinimumSize(500, 200)
+
+        widget = QWidget(self)
+        self.setCentralWidget(widget)
+
+        layout = QVBoxLayout()
+        widget.setLayout(layout)
+
+        self.button_test_interactivity = QPushButton("Test Interactivity", self)
+        self.button_test_interactivity.clicked.connect(self.interactivity_clicked)
+
+        self.text_field_interactivity = QPlainTextEdit(self)
+        self.text_field_interactivity.setReadOnly(True)
+        self.text_field_interactivity.setFixedHeight(30)
+
+        self.button_long_task = QPushButton("Create Long Running Taks", self)
+        self.button_long_task.clicked.connect(self.run_long_task)
+
+        self.button_worker = QPushButton("Create Worker", self)
+        self.button_worker.clicked.connect(self.run_worker)
+
+        self.last_worker_label = QLabel(self)
+        self.last_worker_progress = QProgressBar(self)
+        self.last_worker_progress.setMaximum(100)
+
+        self.text_field_worker = QPlainTextEdit(self)
+        self.text_field_worker.setReadOnly(True)
+        self.text_field_worker.setMaximumBlockCount(1000)
+
+        layout.addWidget(self.button_test_interactivity)
+        layout.addWidget(self.text_field_interactivity)
+        layout.addWidget(self.button_long_task)
+        layout.addWidget(self.button_worker)
+        layout.addWidget(self.last_worker_label)
+        layout.addWidget(self.last_worker_progress)
+        layout.addWidget(self.text_field_worker)
+
+        self.threadpool = QThreadPool()
+
+        self.last_worker_id: str = None
+        self.running_workers = 0
+
+        self.progress_bus = ProgressBus(parent=self)
+        self.progress_bus.percentDone.connect(self.worker_percent_done)
+
+    def interactivity_clicked(self) -> None:
+        msg = "Clicked at: {}.".format(datetime.now())
+        self.text_field_interactivity.setPlainText(msg)
+
+    def run_long_task(self):
+        for i in range(3):
+            time.sleep(1)
+
+    def run_worker(self):
+        worker_id = str(uuid.uuid4()).split("-")[0]
+        worker = Worker(worker_id, self.progress_bus)
+
+        self.last_worker_id = worker_id
+        self.last_worker_progress.setValue(0)
+        self.last_worker_label.setText("Progress for last worker, with id {}.".format(worker_id))
+
+        worker.signal.result.connect(self.print_worker_output)
+        worker.signal.finished.connect(self.worker_finished)
+
+        self.running_workers += 1
+        self.progress_bus.start()
+        self.threadpool.start(worker)
+
+    def print_worker_output(self, output: str):
+        self.text_field_worker.appendPlainText(output)
+
+    def worker_finished(self):
+        self.text_field_worker.appendPlainText("Worker finished!")
+
+        self.running_workers -= 1
+        if self.running_workers == 0:
+            self.progress_bus.stop()
+
+    def worker_percent_done(self, worker_name: str, percent: float):
+        if worker_name == self.last_worker_id:
+            self.last_worker_progress.setValue(int(percent))
+
+
+if __name__ == "__main__":
+
+    app = QApplication(sys.argv)
+    mw = MainWindow()
+    mw.show()
+    sys.exit(app.exec())
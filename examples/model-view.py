@@ -1,25 +1,116 @@
-from typing import Optional
+from typing import Optional, List, Any
+from functools import partial
 import sys
-from osgeo import ogr, osr
+from osgeo import gdal, ogr, osr
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QFormLayout, QTableView, QLineEdit, QLabel,
                              QWidget)
-from PyQt5.QtCore import QAbstractTableModel, QObject, QModelIndex, Qt
+from PyQt5.QtCore import (QAbstractTableModel, QObject, QModelIndex, Qt, QRunnable, QThreadPool,
+                          pyqtSignal)
 from file_select_widget import FileSelector
 
 
+def crs_to_string(crs: osr.SpatialReference) -> str:
+    if crs is None:
+        return ""
+    authority = crs.GetAuthorityName(None)
+    code = crs.GetAuthorityCode(None)
+    if authority and code:
+        return "{}:{}".format(authority, code)
+    else:
+        return crs.ExportToWkt()
+
+
+class LayerDetailsSignals(QObject):
+    layerDetails = pyqtSignal(int, int, str)
+    failed = pyqtSignal(str)
+
+
+class LayerDetailsWorker(QRunnable):
+
+    def __init__(self, path: str, layer_count: int):
+        super(LayerDetailsWorker, self).__init__()
+        self.signal = LayerDetailsSignals()
+        self.path = path
+        self.layer_count = layer_count
+        self.canceled = False
+
+    def run(self):
+        ds: ogr.DataSource = ogr.Open(self.path)
+
+        if ds is None:
+            self.signal.failed.emit(gdal.GetLastErrorMsg())
+            return
+
+        for i in range(self.layer_count):
+            if self.canceled:
+                return
+            layer: ogr.Layer = ds.GetLayer(i)
+            self.signal.layerDetails.emit(i, layer.GetFeatureCount(),
+                                          crs_to_string(layer.GetSpatialRef()))
+
+
 class TableModel(QAbstractTableModel):
 
+    layerDetailsFailed = pyqtSignal(str)
+
+    text_loading = "..."
+    text_failed = "n/a"
+
     def __init__(self, datasource: ogr.DataSource, parent: Optional[QObject] = None) -> None:
         super().__init__(parent)
-        self._ds = datasource
+        self._ds = None
+        self._rows: List[List[Any]] = []
+        self._worker: LayerDetailsWorker = None
+        self.set_ds(datasource)
 
     def set_ds(self, ds: ogr.DataSource) -> None:
+        self.beginResetModel()
+
+        if self._worker:
+            self._worker.canceled = True
+            self._worker = None
+
         self._ds = ds
-        self.layoutChanged.emit()
+        self._rows = []
+
+        if self._ds:
+            for i in range(self._ds.GetLayerCount()):
+                layer: ogr.Layer = self._ds.GetLayer(i)
+                self._rows.append(
+                    [layer.GetName(),
+                     ogr.GeometryTypeToName(layer.GetGeomType()), None, None])
+
+        self.endResetModel()
+
+        if self._rows:
+            self._worker = LayerDetailsWorker(self._ds.GetDescription(), len(self._rows))
+            self._worker.signal.layerDetails.connect(partial(self.set_layer_details, self._worker))
+            self._worker.signal.failed.connect(partial(self.set_layer_details_failed,
+                                                       self._worker))
+            QThreadPool.globalInstance().start(self._worker)
+
+    def set_layer_details(self, worker: LayerDetailsWorker, row: int, feature_count: int,
+                          crs: str) -> None:
+        if worker is not self._worker:
+            return
+
+        self._rows[row][2] = feature_count
+        self._rows[row][3] = crs
+        self.dataChanged.emit(self.index(row, 2), self.index(row, 3))
+
+    def set_layer_details_failed(self, worker: LayerDetailsWorker, message: str) -> None:
+        if worker is not self._worker:
+            return
+
+        for row in self._rows:
+            row[2] = self.text_failed
+            row[3] = self.text_failed
+        self.dataChanged.emit(self.index(0, 2), self.index(len(self._rows) - 1, 3))
+        self.layerDetailsFailed.emit(message)
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
-        if parent == QModelIndex() and self._ds:
-            return self._ds.GetLayerCount()
+        if parent == QModelIndex():
+            return len(self._rows)
         return 0
 
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
@@ -51,25 +142,11 @@ class TableModel(QAbstractTableModel):
 
         if role == Qt.ItemDataRole.DisplayRole:
 
-            layer: ogr.Layer = self._ds.GetLayer(index.row())
-
-            if index.column() == 0:
-                return layer.GetName()
-
-            elif index.column() == 1:
-                return ogr.GeometryTypeToName(layer.GetGeomType())
-
-            elif index.column() == 2:
-                return layer.GetFeatureCount()
-
-            elif index.column() == 3:
-                crs: osr.SpatialReference = layer.GetSpatialRef()
-                authority = crs.GetAuthorityName(None)
-                code = crs.GetAuthorityCode(None)
-                if authority and code:
-                    return "{}:{}".format(authority, code)
-                else:
-                    crs.ExportToWkt()
+            if index.column() < 4:
+                value = self._rows[index.row()][index.column()]
+                if value is None:
+                    return self.text_loading
+                return value
 
             else:
                 return ""
@@ -87,6 +164,7 @@ class MainWindow(QMainWindow):
 
         self.ds: ogr.DataSource = None
         self.table_model = TableModel(self.ds)
+        self.table_model.layerDetailsFailed.connect(self.layer_details_failed)
 
         self.init_gui()
 
@@ -118,6 +196,9 @@ class MainWindow(QMainWindow):
         self.ogr_file.setText("Soubor nevybrán.")
         self.table_model.set_ds(None)
 
+    def layer_details_failed(self, message: str) -> None:
+        self.ogr_file.setText("Podrobnosti o vrstvách nelze načíst: {}".format(message))
+
     def check_is_ogr_ds(self, file_name: str) -> None:
         self.ds = ogr.Open(file_name)
         if self.ds: